@@ -0,0 +1,6 @@
+"""植物大战僵尸Python版的游戏逻辑核心，不依赖窗口，可无界面批量运行"""
+
+from .config import (FPS, GRID_COLS, GRID_ROWS, GRID_SIZE, HEIGHT, LAWN_LEFT, LAWN_TOP,
+                     MAX_LEVEL, PLANT_CARDS, WIDTH)
+from .entities import PLANT_TYPES, ZOMBIE_TYPES
+from .world import World
@@ -0,0 +1,125 @@
+"""贴图资源管理：每个(路径, 尺寸)只解码缩放一次，转换成显示格式后缓存
+
+缩放好的像素还会按源文件修改时间写入磁盘缓存，下次启动直接读原始像素，
+跳过PNG解码和缩放。源文件改动后修改时间变化，旧缓存自动作废。
+"""
+
+import hashlib
+import os
+
+import pygame
+
+# 缓存放在项目目录下的data里，与当前工作目录无关
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(PROJECT_DIR, "data", "cache", "images")
+CACHE_FORMAT = "RGBA"
+
+
+class AssetManager:
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.images = {}  # (路径, 尺寸) -> 已转换为显示格式的表面
+        self.disk_hits = 0
+        self.disk_misses = 0
+
+    def image(self, path, size, default_color=None):
+        """取一张缩放到size的贴图；文件不存在时返回画着圆形的占位图"""
+        key = (path, tuple(size))
+        surface = self.images.get(key)
+        if surface is None:
+            surface = self.images[key] = convert(self._load(path, key[1], default_color))
+        return surface
+
+    def clear(self):
+        self.images.clear()
+
+    def _load(self, path, size, default_color):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            print(f"警告：无法加载贴图 {path}，使用默认图形")
+            return placeholder(size, default_color)
+
+        cache_path = self._cache_path(path, size, mtime)
+        try:
+            with open(cache_path, 'rb') as f:
+                surface = pygame.image.frombytes(f.read(), size, CACHE_FORMAT)
+            self.disk_hits += 1
+            return surface
+        except (OSError, ValueError):
+            pass
+
+        self.disk_misses += 1
+        try:
+            surface = pygame.transform.scale(pygame.image.load(path), size)
+        except pygame.error:
+            print(f"警告：无法加载贴图 {path}，使用默认图形")
+            return placeholder(size, default_color)
+        self._write_cache(cache_path, surface)
+        return surface
+
+    def _cache_path(self, path, size, mtime):
+        digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:10]
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir, f"{name}-{digest}-{size[0]}x{size[1]}-{mtime}.rgba")
+
+    def _write_cache(self, cache_path, surface):
+        prefix = cache_path.rsplit("-", 1)[0] + "-"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 先写临时文件再改名，中途退出也不会留下半个缓存
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(pygame.image.tobytes(surface, CACHE_FORMAT))
+            os.replace(tmp_path, cache_path)
+            # 删掉同一贴图同一尺寸的旧缓存
+            for name in os.listdir(self.cache_dir):
+                old = os.path.join(self.cache_dir, name)
+                if old.startswith(prefix) and old != cache_path:
+                    os.remove(old)
+        except OSError as e:
+            print(f"警告：无法写入贴图缓存 {cache_path}: {e}")
+
+
+def placeholder(size, color):
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    if color:
+        pygame.draw.circle(surface, color, (size[0]//2, size[1]//2), size[0]//2 - 5)
+    return surface
+
+
+def convert(surface):
+    """转换成显示格式，之后每次blit都不用再转换像素格式；还没有窗口时原样返回"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha()
+
+
+class LazyAssets:
+    """名字到资源的映射，第一次取用时才用 loader(*参数) 加载"""
+
+    def __init__(self, loader, specs):
+        self.loader = loader
+        self.specs = specs
+        self.loaded = {}
+
+    def __getitem__(self, name):
+        try:
+            return self.loaded[name]
+        except KeyError:
+            value = self.loaded[name] = self.loader(*self.specs[name])
+            return value
+
+    def __contains__(self, name):
+        return name in self.specs
+
+    def get(self, name, default=None):
+        return self[name] if name in self.specs else default
+
+    def preload(self, names=None):
+        """进入某个界面前把它要用的资源一次加载好，避免第一帧卡顿"""
+        for name in names or self.specs:
+            self[name]
+
+
+ASSETS = AssetManager()
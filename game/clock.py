@@ -0,0 +1,61 @@
+import time
+
+from .config import FPS
+
+SPEEDS = (1, 2, 4, None)  # None 表示不限速，尽可能快地推进
+UNCAPPED_BATCH = 30  # 不限速模式下每次推进的逻辑帧数
+
+
+class SimulationClock:
+    """固定步长时钟：把真实流逝的时间换算成逻辑帧数，逻辑与渲染帧率解耦
+
+    所有游戏计时器都以逻辑帧为单位，渲染掉帧时由累加器补回对应的逻辑帧，
+    加速时按倍数多推进。无界面批量运行直接调用 World.step 即可，不需要时钟。
+    """
+
+    def __init__(self, tick_rate=FPS, max_ticks_per_frame=None):
+        self.tick_ms = 1000 / tick_rate
+        # 一帧最多补多少逻辑帧，防止卡顿后越补越慢
+        self.max_ticks_per_frame = max_ticks_per_frame or tick_rate // 4
+        self.speed = 1
+        self.accumulator = 0.0
+        self.frame_budget = 0.5 / tick_rate  # 不限速模式每个渲染帧留给逻辑的秒数
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def cycle_speed(self):
+        self.speed = SPEEDS[(SPEEDS.index(self.speed) + 1) % len(SPEEDS)]
+        self.accumulator = 0.0
+        return self.speed
+
+    def speed_label(self):
+        return "极速" if self.speed is None else f"{self.speed}x"
+
+    def advance(self, elapsed_ms):
+        """累加真实时间，返回本帧应推进的逻辑帧数"""
+        self.accumulator += elapsed_ms * self.speed
+        ticks = int(self.accumulator / self.tick_ms + 1e-9)  # 容忍浮点累加误差
+        limit = self.max_ticks_per_frame * self.speed
+        if ticks > limit:
+            # 落后太多就丢弃积压的时间，而不是一直追赶
+            ticks = limit
+            self.accumulator = 0.0
+        else:
+            self.accumulator = max(self.accumulator - ticks * self.tick_ms, 0.0)
+        return ticks
+
+    def update(self, world, elapsed_ms):
+        """按当前速度推进world，返回实际推进的逻辑帧数"""
+        if self.speed is not None:
+            return world.step(self.advance(elapsed_ms))
+
+        # 不限速：在本帧的时间预算内尽量多推进
+        deadline = time.perf_counter() + self.frame_budget
+        ticks = 0
+        while time.perf_counter() < deadline:
+            stepped = world.step(UNCAPPED_BATCH)
+            ticks += stepped
+            if stepped < UNCAPPED_BATCH:
+                break
+        return ticks
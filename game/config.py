@@ -0,0 +1,75 @@
+# 游戏参数（逻辑层与渲染层共用）
+WIDTH, HEIGHT = 900, 600
+GRID_SIZE = 80
+GRID_ROWS = 5
+GRID_COLS = 9
+LAWN_LEFT = 100
+LAWN_TOP = 100
+FPS = 60  # 逻辑帧率，所有计时器都以逻辑帧为单位
+
+MAX_LEVEL = 30
+START_SUN = 150  # 初始阳光
+SKY_SUN_INTERVAL = 5 * FPS  # 每5秒掉落一个阳光
+
+# 每关僵尸数量 = 关卡 * 系数
+ZOMBIES_PER_LEVEL = {
+    "easy": 5,
+    "normal": 15,
+    "hard": 25
+}
+
+# 零星出怪的基础速率（平均每帧几只），随关卡进度逐渐加快到三倍
+ZOMBIE_SPAWN_RATE = {
+    "easy": 0.006,
+    "normal": 0.01,
+    "hard": 0.015
+}
+
+# 僵尸种类出现的关卡和概率
+ROADBLOCK_LEVEL = 3  # 第3关后出现路障僵尸
+ROADBLOCK_CHANCE = 0.3
+BUCKETHEAD_LEVEL = 7  # 第7关后出现铁桶僵尸
+BUCKETHEAD_CHANCE = 0.1
+
+# 出怪时间表（game.waves）：每多少只僵尸插一面旗帜（一大波），旗帜波占全部僵尸的比例
+ZOMBIES_PER_FLAG = 20
+FLAG_SHARE = 0.3
+FLAG_WARNING = 3 * FPS  # 一大波之前的空档
+BURST_INTERVAL = FPS // 4  # 一大波里相邻两只僵尸的出场间隔
+
+# 无尽模式：第一波的僵尸数，每波比上一波多的倍数，每波出怪持续的帧数（波越大越密集）
+ENDLESS_FIRST_WAVE = 20
+ENDLESS_GROWTH = 1.25
+ENDLESS_WAVE_TICKS = 30 * FPS
+STRESS_START_WAVE = 26  # 压力测试直接从这一波开始，同屏三千多个僵尸
+
+
+def level_rules(difficulty, overrides=None):
+    """某个难度下的关卡平衡参数，overrides可以覆盖其中任意一项（平衡测试用）"""
+    rules = {
+        "zombies_per_level": ZOMBIES_PER_LEVEL[difficulty],
+        "spawn_rate": ZOMBIE_SPAWN_RATE[difficulty],
+        "roadblock_level": ROADBLOCK_LEVEL,
+        "roadblock_chance": ROADBLOCK_CHANCE,
+        "buckethead_level": BUCKETHEAD_LEVEL,
+        "buckethead_chance": BUCKETHEAD_CHANCE,
+        "zombies_per_flag": ZOMBIES_PER_FLAG,
+        "flag_share": FLAG_SHARE,
+        "pea_prediction": True,  # 豌豆发射时预测命中帧（game.projectiles），关掉后逐帧移动
+        "leak_ends_game": True  # 僵尸进屋即游戏结束；关掉后只计数，便于统计漏怪数量
+    }
+    if overrides:
+        unknown = set(overrides) - set(rules)
+        if unknown:
+            raise KeyError(f"未知的关卡参数: {', '.join(sorted(unknown))}")
+        rules.update(overrides)
+    return rules
+
+
+# 植物卡片：种类 -> (阳光消耗, 冷却帧数)
+PLANT_CARDS = {
+    "peashooter": (100, 3 * FPS),   # 3秒冷却
+    "sunflower": (50, 3 * FPS),     # 3秒冷却
+    "nut_wall": (50, 10 * FPS),     # 10秒冷却
+    "cherry_bomb": (150, 20 * FPS)  # 20秒冷却
+}
@@ -0,0 +1,51 @@
+class EntityList:
+    """实体容器：稳定编号、O(1)标记死亡、每帧末尾统一压缩
+
+    遍历时自动跳过已经死亡的实体；死亡实体在compact之前仍留在列表里，
+    所以一帧内死再多的实体也只需要一次线性压缩。
+    """
+
+    def __init__(self, ids):
+        self.items = []
+        self.by_id = {}
+        self.dead = 0
+        self._ids = ids  # 同一个World里所有容器共用的编号计数器
+
+    def __len__(self):
+        return len(self.items) - self.dead
+
+    def __iter__(self):
+        if not self.dead:
+            return iter(self.items)
+        return (entity for entity in self.items if entity.alive)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def add(self, entity):
+        entity.id = next(self._ids)
+        entity.alive = True
+        self.items.append(entity)
+        self.by_id[entity.id] = entity
+        return entity
+
+    def get(self, entity_id):
+        return self.by_id.get(entity_id)
+
+    def kill(self, entity):
+        """标记死亡，返回是否是这次调用杀死的"""
+        if not entity.alive:
+            return False
+        entity.alive = False
+        del self.by_id[entity.id]
+        self.dead += 1
+        return True
+
+    def compact(self):
+        """移除所有已死亡的实体，返回被移除的实体（可以交还对象池）"""
+        if not self.dead:
+            return []
+        removed = [entity for entity in self.items if not entity.alive]
+        self.items = [entity for entity in self.items if entity.alive]
+        self.dead = 0
+        return removed
@@ -0,0 +1,50 @@
+"""屏幕刷新：整屏flip，或者局部刷新模式下只把变化的矩形区域送到屏幕"""
+
+import pygame
+
+MAX_RECTS = 64  # 脏矩形太多时合并成一个外接矩形，避免逐个提交反而更慢
+
+
+class DisplayUpdater:
+    """收集本帧画过的动态区域，present时决定整屏刷新还是局部刷新
+
+    局部刷新模式下：
+      - 游戏界面每帧仍在后台缓冲区画完整一帧，但只提交本帧和上一帧的动态区域，
+        上一帧的区域用来擦掉已经移走的东西；
+      - 菜单、暂停等静态界面只有收到输入或切换界面后才重画一次。
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.rects = []
+        self.previous = []
+        self.full = True  # 下一帧是否需要整屏刷新
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.invalidate()
+
+    def invalidate(self):
+        self.full = True
+
+    def add(self, rect):
+        if self.enabled:
+            self.rects.append(rect)
+        return rect
+
+    def needs_redraw(self, animated):
+        """局部刷新模式下，没有动画且没被标记为需要整屏刷新的界面不用重画"""
+        return not self.enabled or animated or self.full
+
+    def present(self):
+        if not self.enabled or self.full:
+            pygame.display.flip()
+            self.full = False
+        else:
+            rects = self.previous + self.rects
+            if len(rects) > MAX_RECTS:
+                rects = [rects[0].unionall(rects[1:])]
+            if rects:
+                pygame.display.update(rects)
+        self.previous = self.rects
+        self.rects = []
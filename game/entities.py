@@ -0,0 +1,266 @@
+from .config import FPS, GRID_ROWS, GRID_SIZE, LAWN_LEFT, LAWN_TOP, WIDTH
+
+
+# 植物基类
+class Plant:
+    kind = "plant"
+    __slots__ = ("id", "alive", "row", "col", "x", "y", "health", "max_health",
+                 "attack_cooldown", "cost", "cooldown_time", "cooldown_timer")
+
+    def __init__(self, row, col):
+        self.row = row
+        self.col = col
+        self.x = LAWN_LEFT + col * GRID_SIZE
+        self.y = LAWN_TOP + row * GRID_SIZE
+        self.health = 300  # 普通植物300点生命值
+        self.max_health = 300
+        self.attack_cooldown = 0
+        self.cost = 0
+        self.cooldown_time = 0
+        self.cooldown_timer = 0
+
+    def update(self, world):
+        if self.attack_cooldown > 0:
+            self.attack_cooldown -= 1
+
+    def is_on_cooldown(self):
+        return self.cooldown_timer > 0
+
+    def start_cooldown(self):
+        self.cooldown_timer = self.cooldown_time
+
+    def update_cooldown(self):
+        if self.cooldown_timer > 0:
+            self.cooldown_timer -= 1
+
+
+# 向日葵类
+class Sunflower(Plant):
+    kind = "sunflower"
+    __slots__ = ("sun_cooldown",)
+
+    def __init__(self, row, col):
+        super().__init__(row, col)
+        self.sun_cooldown = 5 * FPS  # 5秒
+        self.cost = 50
+        self.cooldown_time = 5 * FPS  # 5秒冷却
+
+    def update(self, world):
+        self.sun_cooldown -= 1
+        if self.sun_cooldown <= 0:
+            world.add_sun(25)
+            self.sun_cooldown = 5 * FPS  # 重置为5秒
+
+
+# 豌豆射手类
+class Peashooter(Plant):
+    kind = "peashooter"
+    __slots__ = ()
+
+    def __init__(self, row, col):
+        super().__init__(row, col)
+        self.attack_cooldown = 1.5 * FPS  # 1.5秒攻击间隔
+        self.cost = 100
+        self.cooldown_time = 6 * FPS  # 6秒冷却
+
+    def update(self, world):
+        self.attack_cooldown -= 1
+        # 本行前方有僵尸才发射
+        if self.attack_cooldown <= 0 and world.zombie_ahead(self.row, self.x):
+            world.spawn_pea(self.x + GRID_SIZE//2, self.y + GRID_SIZE//2, self.row)
+            self.attack_cooldown = 1.5 * FPS  # 重置攻击间隔
+
+
+# 坚果墙类
+class NutWall(Plant):
+    kind = "nut_wall"
+    __slots__ = ()
+
+    def __init__(self, row, col):
+        super().__init__(row, col)
+        self.health = 4000  # 坚果墙4000点生命值
+        self.max_health = 4000
+        self.cost = 50
+        self.cooldown_time = 30 * FPS  # 30秒冷却
+
+    def update(self, world):
+        # 坚果墙不攻击，只作为障碍物
+        pass
+
+
+# 樱桃炸弹类
+class CherryBomb(Plant):
+    kind = "cherry_bomb"
+    __slots__ = ("explode_timer", "has_exploded", "marked_for_removal")
+
+    def __init__(self, row, col):
+        super().__init__(row, col)
+        self.health = 300
+        self.max_health = 300
+        self.cost = 150
+        self.cooldown_time = 50 * FPS  # 50秒冷却
+        self.explode_timer = 2 * FPS  # 2秒后爆炸
+        self.has_exploded = False
+        self.marked_for_removal = False
+
+    def update(self, world):
+        self.explode_timer -= 1
+        if self.explode_timer <= 0 and not self.has_exploded:
+            self.explode(world)
+
+    def explode(self, world):
+        self.has_exploded = True
+        world.play_sound("cherry_bomb")
+
+        # 爆炸范围：3x3的格子
+        center_row, center_col = self.row, self.col
+
+        # 对范围内的僵尸造成伤害：相邻三行中列号相差不超过1的僵尸
+        left = LAWN_LEFT + (center_col - 1) * GRID_SIZE
+        right = LAWN_LEFT + (center_col + 2) * GRID_SIZE
+        zombies_to_remove = []
+        for row in range(max(center_row - 1, 0), min(center_row + 2, GRID_ROWS)):
+            zombies_to_remove.extend(world.zombies_in(row, left, right))
+
+        # 在循环外移除僵尸
+        for zombie in zombies_to_remove:
+            world.kill_zombie(zombie)
+
+        # 标记樱桃炸弹为待移除
+        self.marked_for_removal = True
+
+
+PLANT_TYPES = {
+    "peashooter": Peashooter,
+    "sunflower": Sunflower,
+    "nut_wall": NutWall,
+    "cherry_bomb": CherryBomb
+}
+
+
+# 豌豆类
+class Pea:
+    kind = "pea"
+    __slots__ = ("id", "alive", "x", "y", "row", "speed", "damage")
+
+    def __init__(self, x, y, row):
+        self.x = x
+        self.y = y
+        self.row = row
+        self.speed = 8  # 增加豌豆速度
+        self.damage = 20
+
+    def update(self, world):
+        self.x += self.speed
+        # 豌豆和僵尸在同一行时纵向必然对齐，只需比较x
+        zombie = world.zombie_lanes.first_within(self.row, self.x, 30)
+        if zombie is not None:
+            zombie.health -= self.damage
+            world.play_sound("pea_hit")
+            return True
+        if self.x > WIDTH:
+            return True
+        return False
+
+
+# 僵尸基类
+class Zombie:
+    kind = "zombie"
+    __slots__ = ("id", "alive", "row", "x", "y", "health", "max_health", "speed",
+                 "attack_cooldown", "attack_sound_playing", "attack_damage")
+
+    def __init__(self, row, difficulty="normal"):
+        self.row = row
+        self.x = WIDTH
+        self.y = LAWN_TOP + row * GRID_SIZE
+        self.health = 100
+        self.speed = 1.0  # 增加基础速度
+        self.attack_cooldown = 0
+        self.attack_sound_playing = False
+        self.attack_damage = 50  # 每次攻击造成50点伤害
+
+        # 根据难度调整属性
+        if difficulty == "easy":
+            self.health = 80
+            self.speed = 0.8
+        elif difficulty == "hard":
+            self.health = 150
+            self.speed = 1.2
+        self.max_health = self.health
+
+    def update(self, world):
+        plant = world.plant_lanes.first_within(self.row, self.x, GRID_SIZE)
+        if plant is not None:
+            if self.attack_cooldown <= 0:
+                plant.health -= self.attack_damage  # 每次攻击50点伤害
+                self.attack_cooldown = 1 * FPS  # 1秒攻击间隔
+                if not self.attack_sound_playing:
+                    world.play_sound("zombie_attack")
+                    self.attack_sound_playing = True
+        else:
+            self.x -= self.speed
+            self.attack_sound_playing = False
+
+        if self.attack_cooldown > 0:
+            self.attack_cooldown -= 1
+
+        if self.x < LAWN_LEFT:
+            return True
+
+        return False
+
+
+# 普通僵尸
+class NormalZombie(Zombie):
+    __slots__ = ()
+
+
+# 路障僵尸
+class RoadblockZombie(Zombie):
+    kind = "roadblock_zombie"
+    __slots__ = ()
+
+    def __init__(self, row, difficulty="normal"):
+        super().__init__(row, difficulty)
+        self.health = 560  # 28个豌豆 * 20伤害
+        self.max_health = self.health
+        self.speed = 0.6  # 稍微慢一点
+
+
+# 铁桶僵尸
+class BucketheadZombie(Zombie):
+    kind = "buckethead_zombie"
+    __slots__ = ()
+
+    def __init__(self, row, difficulty="normal"):
+        super().__init__(row, difficulty)
+        self.health = 2600  # 130个豌豆 * 20伤害
+        self.max_health = self.health
+        self.speed = 0.4  # 更慢
+
+
+ZOMBIE_TYPES = {
+    "zombie": NormalZombie,
+    "roadblock_zombie": RoadblockZombie,
+    "buckethead_zombie": BucketheadZombie
+}
+
+
+# 阳光类
+class Sun:
+    kind = "sun"
+    __slots__ = ("id", "alive", "x", "y", "target_y", "speed", "value", "timer")
+
+    def __init__(self, x, target_y):
+        self.x = x
+        self.y = 0
+        self.target_y = target_y
+        self.speed = 2  # 增加阳光下落速度
+        self.value = 25
+        self.timer = 10 * FPS  # 10秒存在时间
+
+    def update(self, world):
+        if self.y < self.target_y:
+            self.y += self.speed
+        self.timer -= 1
+        return self.timer <= 0
@@ -0,0 +1,118 @@
+"""存档的追加日志：统计和进度的增量随时追加一行，写存档快照后再从日志里删掉
+
+每行是一条带序号的增量 {"seq": n, "add": {...}, "set": {...}}，快照里记着已经
+合并到的序号 journal_seq。启动时把序号更大的增量重新应用到快照上，崩溃时最多
+丢掉最后一行没写完的增量，又不用每次都重写整个存档。
+"""
+
+import json
+import os
+import threading
+
+from .save import SAVE_DIR
+
+
+def journal_path(difficulty, directory=SAVE_DIR):
+    return os.path.join(directory, f"game_journal_{difficulty}.jsonl")
+
+
+def apply_entry(data, entry):
+    for key, value in entry.get("add", {}).items():
+        data[key] = data.get(key, 0) + value
+    data.update(entry.get("set", {}))
+
+
+class StatsJournal:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()  # 追加在主线程，压缩在写存档的线程
+        self.file = None
+        self.seq = 0  # 最后一条增量的序号
+        self.entries = []  # 还没压缩掉的 (序号, 增量)
+        self.loaded = False
+        self.needs_newline = False  # 日志最后一行没写完整，下次追加前先换行
+
+    def recover(self, data):
+        """把快照之后的增量应用到快照data上并返回它"""
+        with self.lock:
+            if not self.loaded:
+                self._read()
+            base = data.get("journal_seq", 0)
+            self.seq = max(self.seq, base)  # 日志压缩清空后序号接着快照往下排
+            for seq, entry in self.entries:
+                if seq > base:
+                    apply_entry(data, entry)
+            return data
+
+    def append(self, add=None, assign=None):
+        """追加一条增量，返回它的序号"""
+        with self.lock:
+            if not self.loaded:
+                self._read()
+            self.seq += 1
+            entry = {"seq": self.seq}
+            if add:
+                entry["add"] = add
+            if assign:
+                entry["set"] = assign
+            try:
+                if self.file is None:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    self.file = open(self.path, 'a', encoding='utf-8')
+                    if self.needs_newline:
+                        self.file.write("\n")
+                        self.needs_newline = False
+                self.file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+                self.file.flush()
+            except OSError as e:
+                print(f"写入统计日志失败: {e}")
+            self.entries.append((self.seq, entry))
+            return self.seq
+
+    def compacted(self, seq):
+        """包含序号seq及之前增量的快照已经写到磁盘：把它们从日志里删掉"""
+        with self.lock:
+            self.entries = [(s, entry) for s, entry in self.entries if s > seq]
+            self._close()
+            self.needs_newline = False
+            try:
+                if not self.entries:
+                    if os.path.exists(self.path):
+                        os.remove(self.path)
+                    return
+                # 压缩期间追加的增量要保留下来
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    for _, entry in self.entries:
+                        f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"压缩统计日志失败: {e}")
+
+    def close(self):
+        with self.lock:
+            self._close()
+
+    def _close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _read(self):
+        self.loaded = True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        self.needs_newline = bool(lines) and not lines[-1].endswith("\n")
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                seq = entry["seq"]
+            except (ValueError, KeyError, TypeError):
+                continue  # 崩溃时没写完的最后一行
+            self.entries.append((seq, entry))
+            self.seq = max(self.seq, seq)
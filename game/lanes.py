@@ -0,0 +1,81 @@
+from bisect import bisect_left, bisect_right
+
+
+class LaneIndex:
+    """按行分桶、每行按x排序的实体索引，用二分查找代替遍历全场
+
+    实体死亡时不从索引里删除，查询会跳过 alive 为 False 的实体；帧末 refresh 一次性剔除，
+    一帧里死再多的实体也只需要一次线性扫描。
+    """
+
+    def __init__(self, rows):
+        self.lanes = [[] for _ in range(rows)]
+        self.keys = [[] for _ in range(rows)]  # 与lanes一一对应的x坐标
+
+    def __len__(self):
+        return sum(len(lane) for lane in self.lanes)
+
+    def add(self, entity):
+        lane, keys = self.lanes[entity.row], self.keys[entity.row]
+        i = bisect_right(keys, entity.x)
+        keys.insert(i, entity.x)
+        lane.insert(i, entity)
+
+    def clear(self):
+        for lane, keys in zip(self.lanes, self.keys):
+            lane.clear()
+            keys.clear()
+
+    def refresh(self):
+        """实体移动之后调用：剔除已死亡的实体，重新排序并同步x坐标（几乎有序，代价接近线性）"""
+        for row, lane in enumerate(self.lanes):
+            lane = self.lanes[row] = [entity for entity in lane if entity.alive]
+            lane.sort(key=_x)
+            self.keys[row] = [entity.x for entity in lane]
+
+    def lane(self, row):
+        return self.lanes[row]
+
+    def between(self, row, lo, hi):
+        """返回第row行中 lo <= x < hi 的存活实体"""
+        keys = self.keys[row]
+        lane = self.lanes[row][bisect_left(keys, lo):bisect_left(keys, hi)]
+        return [entity for entity in lane if entity.alive]
+
+    def first_within(self, row, x, distance):
+        """返回第row行中 |entity.x - x| < distance 的最左侧存活实体"""
+        return self.first_between(row, x - distance, x + distance)
+
+    def first_between(self, row, lo, hi):
+        """返回第row行中 lo < x < hi 的最左侧存活实体"""
+        keys, lane = self.keys[row], self.lanes[row]
+        i = bisect_right(keys, lo)
+        while i < len(keys) and keys[i] < hi:
+            if lane[i].alive:
+                return lane[i]
+            i += 1
+        return None
+
+    def any_ahead(self, row, x):
+        """第row行中是否有 x 坐标大于给定值的存活实体"""
+        keys, lane = self.keys[row], self.lanes[row]
+        i = len(keys) - 1
+        while i >= 0 and keys[i] > x:
+            if lane[i].alive:
+                return True
+            i -= 1
+        return False
+
+    def at(self, row, x):
+        """返回第row行中x坐标恰好等于给定值的存活实体"""
+        keys, lane = self.keys[row], self.lanes[row]
+        i = bisect_left(keys, x)
+        while i < len(keys) and keys[i] == x:
+            if lane[i].alive:
+                return lane[i]
+            i += 1
+        return None
+
+
+def _x(entity):
+    return entity.x
@@ -0,0 +1,96 @@
+"""背景音乐：用 pygame.mixer.music 流式播放，不把整首MP3解码进内存
+
+同一时间只有一条音乐流，所以切换曲目是先淡出当前曲目、再淡入新曲目。
+调音量只改音量，不会让曲目从头播放。
+"""
+
+import os
+
+import pygame
+
+MUSIC_TRACKS = {
+    "main_menu": "lawnbgm(1).mp3",
+    "settings": "lawnbgm(2).mp3",
+    "game": "lawnbgm(3).mp3"
+}
+FADE_MS = 500  # 切换曲目时淡出、淡入各用的毫秒数
+
+
+class MusicPlayer:
+    def __init__(self, tracks=MUSIC_TRACKS, volume=0.5, fade_ms=FADE_MS, stream=None):
+        self.tracks = tracks
+        self.stream = stream if stream is not None else pygame.mixer.music
+        self.volume = volume
+        self.fade_ms = fade_ms
+        self.current = None  # 正在播放的曲目名
+        self.next = None  # 淡出结束后要播放的(曲目名, 是否循环)
+        self.fade_level = 1.0  # 淡出进度，实际音量为 volume * fade_level
+        self.queue = []  # 当前曲目播完后依次播放的曲目
+        self._exists = {}
+
+    def available(self, name):
+        if name not in self._exists:
+            self._exists[name] = name in self.tracks and os.path.exists(self.tracks[name])
+        return self._exists[name]
+
+    def play(self, name, loop=True):
+        """切换到name；已经在放这首时什么也不做"""
+        if not self.available(name):
+            return False
+        self.queue.clear()
+        if name == self.current:
+            if self.next is not None:
+                # 淡出途中又切回来：取消切换，恢复音量
+                self.next = None
+                self.fade_level = 1.0
+                self._apply_volume()
+            return True
+        if self.current is None or not self.stream.get_busy():
+            self._start(name, loop)
+        else:
+            self.next = (name, loop)
+        return True
+
+    def enqueue(self, name):
+        """当前曲目播完后接着播放name（不循环）"""
+        if self.available(name):
+            self.queue.append(name)
+
+    def set_volume(self, volume):
+        self.volume = volume
+        self._apply_volume()
+
+    def stop(self):
+        self.stream.stop()
+        self.current = None
+        self.next = None
+        self.queue.clear()
+
+    def update(self, elapsed_ms):
+        """每个渲染帧调用一次，推进淡出和播放队列"""
+        if self.next is not None:
+            if self.fade_ms > 0:
+                self.fade_level = max(self.fade_level - elapsed_ms / self.fade_ms, 0.0)
+            else:
+                self.fade_level = 0.0
+            self._apply_volume()
+            if self.fade_level == 0.0:
+                self._start(*self.next)
+        elif self.current is not None and self.queue and not self.stream.get_busy():
+            self._start(self.queue.pop(0), False)
+
+    def _apply_volume(self):
+        self.stream.set_volume(self.volume * self.fade_level)
+
+    def _start(self, name, loop):
+        self.next = None
+        self.fade_level = 1.0
+        try:
+            self.stream.load(self.tracks[name])
+            self._apply_volume()
+            self.stream.play(-1 if loop else 0, fade_ms=self.fade_ms)
+        except pygame.error as e:
+            print(f"警告：无法播放音乐 {self.tracks[name]}: {e}")
+            self.current = None
+            return
+        self.current = name
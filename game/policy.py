@@ -0,0 +1,111 @@
+"""脚本化的种植策略，用于无界面的平衡测试和压力测试"""
+
+from .config import FPS, GRID_COLS, GRID_ROWS, GRID_SIZE, LAWN_LEFT, PLANT_CARDS
+
+DECISION_INTERVAL = 15  # 每0.25秒做一次决定，模拟玩家的反应时间
+PEA_DAMAGE_PER_TICK = 20 / (1.5 * FPS)  # 一棵豌豆射手平均每帧的伤害（20点伤害，1.5秒一发）
+TICKS_PER_HEALTH = FPS / 50  # 僵尸一秒啃一口50点，植物每点生命值能拖住一只僵尸的帧数
+
+
+class ScriptedPolicy:
+    """简单但不笨的玩家：收集所有阳光，先铺向日葵，火力不够的行再按需补豌豆射手和坚果墙
+
+    每行估算最靠前的僵尸进屋之前（算上啃挡路植物的时间）本行火力能打掉多少血，
+    打不完的行按剩余时间从短到长补救。豌豆射手和坚果墙只种在本行最靠前的僵尸
+    前面（左边）至少一格的地方，种在它身后既打不到它也挡不住它；来不及时丢樱桃炸弹。
+    向日葵种在 sunflower_cols 列，顺便替身后 shooter_cols 列的豌豆射手挡几口。
+    """
+
+    def __init__(self, sunflower_cols=(1,), shooter_cols=(0, 1, 2, 3, 4), sunflowers=GRID_ROWS, margin=1.0):
+        self.sunflower_cols = sunflower_cols
+        self.shooter_cols = shooter_cols
+        self.wall_cols = range(max(shooter_cols) + 1, GRID_COLS)
+        self.sunflowers = sunflowers  # 向日葵的目标数量
+        self.margin = margin  # 估算的僵尸血量乘以这个倍数再和火力比较
+
+    def act(self, world):
+        for sun in list(world.suns):
+            world.collect_sun(sun.id)
+
+        zombies = [[] for _ in range(GRID_ROWS)]
+        for zombie in world.zombies:
+            zombies[zombie.row].append(zombie)
+        plants = [[] for _ in range(GRID_ROWS)]
+        for plant in world.plants:
+            plants[plant.row].append(plant)
+
+        # 火力不够的行，按最靠前的僵尸进屋的剩余帧数排序
+        short = []
+        for row in range(GRID_ROWS):
+            if zombies[row]:
+                front = min(zombies[row], key=lambda zombie: zombie.x)
+                ticks, deficit = self._deficit(zombies[row], plants[row], front)
+                if deficit > 0:
+                    short.append((ticks, row, front))
+        short.sort(key=lambda item: item[0])
+        for ticks, row, front in short:
+            if self._rescue(world, row, front, ticks):
+                return
+            # 阳光不够或冷却中就攒着，不往别处花；僵尸已经走过所有豌豆射手的列时这一行只能放弃
+            if front.x >= LAWN_LEFT + (min(self.shooter_cols) + 1) * GRID_SIZE:
+                return
+
+        fronts = [min(zombie.x for zombie in lane) if lane else None for lane in zombies]
+
+        # 经济：向日葵优先
+        sunflowers = sum(1 for lane in plants for plant in lane if plant.kind == "sunflower")
+        if sunflowers < self.sunflowers:
+            for row in sorted(range(GRID_ROWS), key=lambda row: len(plants[row])):
+                if self._place(world, "sunflower", row, self.sunflower_cols, fronts[row]):
+                    return
+            return
+
+        # 阳光富余时先给有僵尸的行加豌豆射手，再铺空行，留一个樱桃炸弹的钱
+        if world.sun_count >= PLANT_CARDS["peashooter"][0] + PLANT_CARDS["cherry_bomb"][0]:
+            for row in sorted(range(GRID_ROWS), key=lambda row: -len(zombies[row])):
+                if self._place(world, "peashooter", row, self.shooter_cols, fronts[row]):
+                    return
+
+    def _deficit(self, zombies, plants, front):
+        """返回 (本行最靠前的僵尸进屋前还剩的帧数, 本行火力还差的伤害)"""
+        ahead = [plant for plant in plants if plant.x < front.x]
+        ticks = (front.x - LAWN_LEFT) / front.speed
+        # 挡路的植物要被本行的僵尸一起啃完才能过去
+        ticks += sum(plant.health for plant in ahead) * TICKS_PER_HEALTH / len(zombies)
+        shooters = sum(1 for plant in ahead if plant.kind == "peashooter")
+        health = sum(zombie.health for zombie in zombies)
+        return ticks, health * self.margin - shooters * PEA_DAMAGE_PER_TICK * ticks
+
+    def _rescue(self, world, row, front, ticks):
+        """给火力不够的一行补救，种下了东西时返回True"""
+        # 僵尸快进屋了：樱桃炸弹炸它两秒后所在的格子
+        if ticks < 8 * FPS or front.x < LAWN_LEFT + 2 * GRID_SIZE:
+            x = front.x - front.speed * 2 * FPS
+            col = min(max(int((x - LAWN_LEFT) // GRID_SIZE), 0), GRID_COLS - 1)
+            if self._place(world, "cherry_bomb", row, (col, col + 1, col - 1)):
+                return True
+        if self._place(world, "peashooter", row, self.shooter_cols, front.x):
+            return True
+        # 豌豆射手种不了时，用坚果墙在豌豆射手前面拖住僵尸
+        return self._place(world, "nut_wall", row, self.wall_cols, front.x)
+
+    def _place(self, world, kind, row, cols, limit=None):
+        """在row行的cols列中按顺序找空格种下；给了limit时只种在离limit至少一格的左边"""
+        if not world.can_plant(kind):
+            return False
+        for col in cols:
+            if not 0 <= col < GRID_COLS:
+                continue
+            if limit is not None and LAWN_LEFT + (col + 1) * GRID_SIZE > limit:
+                continue
+            if world.place_plant(kind, row, col) is not None:
+                return True
+        return False
+
+
+def run_policy(world, policy, max_ticks, interval=DECISION_INTERVAL):
+    """让策略打完一关（或到max_ticks为止），返回world"""
+    while world.tick < max_ticks and not (world.game_over or world.completed):
+        policy.act(world)
+        world.step(min(interval, max_ticks - world.tick))
+    return world
@@ -0,0 +1,72 @@
+import sys
+
+
+class Pool:
+    """空闲对象表：回收死亡的实体，下次创建时重新初始化后复用，减少分配和GC"""
+
+    def __init__(self, cls, limit=4096):
+        self.cls = cls
+        self.limit = limit  # 空闲表上限，避免一波大战之后一直占着内存
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.__init__(*args)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.cls(*args)
+
+    def release(self, obj):
+        if len(self.free) < self.limit:
+            self.free.append(obj)
+
+
+class PoolSet:
+    """按实体类分别维护对象池"""
+
+    def __init__(self):
+        self.pools = {}
+
+    def acquire(self, cls, *args):
+        pool = self.pools.get(cls)
+        if pool is None:
+            pool = self.pools[cls] = Pool(cls)
+        return pool.acquire(*args)
+
+    def release(self, obj):
+        pool = self.pools.get(type(obj))
+        if pool is not None:
+            pool.release(obj)
+
+    def stats(self):
+        return {cls.__name__: {"created": pool.created, "reused": pool.reused, "free": len(pool.free)}
+                for cls, pool in self.pools.items()}
+
+
+# 同一进程里的World共用一组对象池，换关时回收的实体可以留给下一关
+POOLS = PoolSet()
+
+
+def entity_size(obj):
+    """单个实体占用的字节数（对象本身加上实例字典，不含共享的数值对象）"""
+    size = sys.getsizeof(obj)
+    instance_dict = getattr(obj, "__dict__", None)
+    if instance_dict is not None:
+        size += sys.getsizeof(instance_dict)
+    return size
+
+
+def memory_report(world):
+    """按实体种类统计数量和内存占用"""
+    report = {}
+    for group in (world.plants, world.zombies, world.peas, world.suns):
+        for entity in group:
+            entry = report.setdefault(entity.kind, {"count": 0, "bytes_each": entity_size(entity)})
+            entry["count"] += 1
+    for entry in report.values():
+        entry["bytes_total"] = entry["count"] * entry["bytes_each"]
+    return report
@@ -0,0 +1,108 @@
+"""分阶段的帧耗时统计：每帧各阶段的毫秒数存进环形缓冲区，可以算分位数、导出CSV/JSON
+
+主循环每个阶段结束时调用一次 mark，逻辑帧内部的阶段由 World 调用 add 累加；
+关闭时 mark/add 直接返回，几乎没有开销。
+"""
+
+import csv
+import json
+import time
+from collections import deque
+
+HISTORY_FRAMES = 600  # 保留最近多少帧，60FPS下约10秒
+
+
+def percentile(sorted_values, q):
+    """已排序数据的q分位数（最近秩法）"""
+    if not sorted_values:
+        return 0.0
+    index = min(int(q / 100 * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    def __init__(self, history=HISTORY_FRAMES, enabled=False):
+        self.enabled = enabled
+        self.frames = deque(maxlen=history)  # 每帧一条：{"frame", "total", 阶段: 毫秒, "counts": {...}}
+        self.phases = []  # 出现过的阶段名，按首次出现的顺序
+        self.frame = 0
+        self.current = {}
+        self.frame_start = 0.0
+        self.last = 0.0
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {}
+        self.frame_start = self.last = time.perf_counter()
+
+    def mark(self, phase):
+        """记录从上一个mark（或帧开始）到现在的耗时，归到phase"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.add(phase, now - self.last)
+        self.last = now
+
+    def add(self, phase, seconds):
+        if not self.enabled:
+            return
+        if phase not in self.current:
+            self.current[phase] = 0.0
+            if phase not in self.phases:
+                self.phases.append(phase)
+        self.current[phase] += seconds * 1000
+
+    def end_frame(self, counts=None):
+        if not self.enabled:
+            return
+        self.frame += 1
+        record = dict(self.current)
+        record["frame"] = self.frame
+        record["total"] = (time.perf_counter() - self.frame_start) * 1000
+        record["counts"] = counts or {}
+        self.frames.append(record)
+
+    def clear(self):
+        self.frames.clear()
+        self.phases.clear()
+        self.current = {}
+
+    def summary(self):
+        """每个阶段（以及整帧total）的 (p50, p95, p99) 毫秒"""
+        result = {}
+        for phase in self.phases + ["total"]:
+            values = sorted(record.get(phase, 0.0) for record in self.frames)
+            result[phase] = tuple(percentile(values, q) for q in (50, 95, 99))
+        return result
+
+    def latest_counts(self):
+        return self.frames[-1]["counts"] if self.frames else {}
+
+    def rows(self):
+        """展开成每帧一行的字典，实体数量放在 count_ 开头的列"""
+        count_names = []
+        for record in self.frames:
+            for name in record["counts"]:
+                if name not in count_names:
+                    count_names.append(name)
+        for record in self.frames:
+            row = {"frame": record["frame"], "total": round(record["total"], 4)}
+            for phase in self.phases:
+                row[phase] = round(record.get(phase, 0.0), 4)
+            for name in count_names:
+                row[f"count_{name}"] = record["counts"].get(name, 0)
+            yield row
+
+    def export(self, path):
+        """按扩展名导出为 .json 或 .csv"""
+        rows = list(self.rows())
+        if path.endswith(".json"):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"summary": self.summary(), "frames": rows}, f, ensure_ascii=False)
+        else:
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["frame", "total"])
+                writer.writeheader()
+                writer.writerows(rows)
+        return len(rows)
@@ -0,0 +1,160 @@
+"""豌豆的命中预测：发射时就算出最早可能命中的帧，飞行途中不再逐帧移动和查找僵尸
+
+僵尸只会向左走（或停下吃植物），速度不超过已出场僵尸的最大速度，所以本行最左侧
+还没被越过的僵尸给出了命中时间的下界。豌豆在这一帧醒来，用和逐帧移动完全相同的
+判定检查一次：命中就结算，没命中就按当前位置重新算下界。结果和逐帧移动一致，
+只是中间那些肯定不会命中的帧都跳过了。
+
+本行新来了僵尸（只有出怪和添加会让下界提前）时，重新规划这一行所有飞行中的豌豆；
+僵尸死亡、停下都只会让命中更晚，不用重新规划。
+
+判定区间是 [上一帧位置 - 30, 本帧位置 + 30) 与逐帧判定区间 (x - 30, x + 30) 的并，
+速度不超过60时两者相同；速度更快时扫过的整段都算，不会穿过僵尸。
+"""
+
+import heapq
+import itertools
+from bisect import bisect_right
+
+from .config import WIDTH
+from .entities import Pea
+
+HIT_RADIUS = 30  # 和 Pea.update 的命中距离一致
+
+
+class FlyingPea(Pea):
+    """预测模式的豌豆：飞行中的位置由发射点、速度和世界帧数算出
+
+    飞行结束（命中、飞出屏幕或被移除）时位置固定下来，并且不再引用world，
+    回收进对象池的豌豆不会让已经结束的一局一直留在内存里。
+    """
+    __slots__ = ("launch_tick", "world", "plan")  # plan: 当前有效的堆条目
+    origin = Pea.x  # 发射点（飞行结束后是最终位置）存在父类的x槽位里
+
+    def __init__(self, x, y, row, world):
+        super().__init__(x, y, row)
+        self.world = world
+        self.launch_tick = world.tick
+        self.plan = None
+
+    @property
+    def x(self):
+        if self.world is None:
+            return self.origin
+        # launch_tick 是还停在发射点的最后一帧，之后每帧前进speed
+        return self.origin + self.speed * (self.world.tick - self.launch_tick)
+
+    @x.setter
+    def x(self, value):
+        self.origin = value
+
+    def land(self):
+        """飞行结束：固定当前位置，断开对world的引用"""
+        self.origin = self.x
+        self.world = None
+        self.plan = None
+
+
+def hit_window(x, speed):
+    """豌豆在位置x（本帧移动之后）的命中区间，开区间 (lo, hi)"""
+    return min(x - HIT_RADIUS, x - speed + HIT_RADIUS), x + HIT_RADIUS
+
+
+class PeaPlanner:
+    def __init__(self, rows):
+        self.flying = [{} for _ in range(rows)]  # 每行飞行中的豌豆：编号 -> 豌豆
+        self.dirty = set()  # 来了新僵尸、需要重新规划的行
+        self.wakeups = []  # 堆：(醒来的帧, 序号, 豌豆)
+        self.stale = 0  # 堆里已经作废的条目数，超过有效条目时重建堆
+        self.sequence = itertools.count()
+        self.max_zombie_speed = 0.0
+        self.updated = 0  # 上一次处理豌豆的帧
+        self.checks = 0  # 实际做过的命中判定次数
+
+    def __len__(self):
+        return sum(len(lane) for lane in self.flying)
+
+    def launch(self, pea, world):
+        # 植物在本帧豌豆阶段之前发射的豌豆本帧就飞出第一步，其余的（比如两帧之间加入的）从下一帧开始
+        if self.updated < world.tick:
+            pea.launch_tick = world.tick - 1
+        self.flying[pea.row][pea.id] = pea
+        self._plan(pea, world, world.tick)
+
+    def cancel(self, pea):
+        """从飞行表中移除豌豆，它原来在飞行时返回True"""
+        if self.flying[pea.row].pop(pea.id, None) is None:
+            return False
+        if pea.plan is not None:
+            self.stale += 1
+        pea.land()
+        return True
+
+    def zombie_added(self, zombie):
+        self.max_zombie_speed = max(self.max_zombie_speed, zombie.speed)
+        if self.flying[zombie.row]:
+            self.dirty.add(zombie.row)
+
+    def update(self, world):
+        """处理本帧醒来的豌豆，返回命中或飞出屏幕的豌豆"""
+        tick = self.updated = world.tick
+        for row in self.dirty:
+            for pea in self.flying[row].values():
+                self._plan(pea, world, tick)
+        self.dirty.clear()
+
+        done = []
+        wakeups = self.wakeups
+        lanes = world.zombie_lanes
+        while wakeups and wakeups[0][0] <= tick:
+            entry = heapq.heappop(wakeups)
+            pea = entry[2]
+            if entry is not pea.plan:
+                self.stale -= 1  # 提前过的旧条目，或者豌豆已经回收
+                continue
+            pea.plan = None
+            self.checks += 1
+            x = pea.x
+            lo, hi = hit_window(x, pea.speed)
+            zombie = lanes.first_between(pea.row, lo, hi)
+            if zombie is not None:
+                zombie.health -= pea.damage
+                world.play_sound("pea_hit")
+            elif x <= WIDTH:
+                self._plan(pea, world, tick + 1)
+                continue
+            self.cancel(pea)
+            done.append(pea)
+        return done
+
+    def _plan(self, pea, world, earliest):
+        """按当前僵尸位置算出豌豆最早可能命中（或飞出屏幕）的帧，不早于earliest；
+        只有比已经安排的帧更早时才加入堆，原来的安排也是有效的下界"""
+        tick = world.tick
+        speed = pea.speed
+        x = pea.x
+        # 第一次 x > WIDTH 的帧
+        wake = tick if x > WIDTH else tick + int((WIDTH - x) // speed) + 1
+        keys = world.zombie_lanes.keys[pea.row]
+        i = bisect_right(keys, hit_window(x, speed)[0])
+        if i < len(keys):
+            # 这只僵尸以最大速度迎面走来，距离缩到命中半径以内至少还要 gap / (豌豆速度 + 僵尸速度) 帧
+            gap = keys[i] - x - HIT_RADIUS
+            if gap > 0:
+                wake = min(wake, tick + int(gap // (speed + self.max_zombie_speed)))
+            else:
+                wake = tick
+        wake = max(wake, earliest)
+        if pea.plan is None or wake < pea.plan[0]:
+            if pea.plan is not None:
+                self.stale += 1
+            pea.plan = (wake, next(self.sequence), pea)
+            heapq.heappush(self.wakeups, pea.plan)
+            if self.stale > len(self.wakeups) - self.stale:
+                self._rebuild()
+
+    def _rebuild(self):
+        """只保留每颗飞行中豌豆当前的条目；原地修改，update 里的局部引用依然有效"""
+        self.wakeups[:] = [pea.plan for lane in self.flying for pea in lane.values() if pea.plan is not None]
+        heapq.heapify(self.wakeups)
+        self.stale = 0
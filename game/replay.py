@@ -0,0 +1,176 @@
+"""录像：记录种子、难度、关卡、关卡参数和带逻辑帧号的玩家输入，可以无界面全速回放
+
+用法: python -m game.replay data/replays/xxx.json [--profile]
+"""
+
+import functools
+import json
+import os
+import sys
+
+from .save import write_atomic
+from .world import World
+
+REPLAY_VERSION = 2  # 2: 僵尸按出怪时间表（game.waves）生成，旧录像无法复现
+
+
+class Replay:
+    def __init__(self, seed, difficulty, level, inputs=None, ticks=0, result=None, endless=0, rules=None):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.level = level
+        self.endless = endless  # 无尽模式的起始波数，0表示普通关卡
+        self.rules = rules  # 录制时完整的关卡参数（game.config.level_rules），None表示该难度的默认值
+        # 每条输入为 [逻辑帧号, 动作, 参数...]
+        #   [t, "p", kind, row, col] 种植   [t, "s", sun_id] 收集阳光
+        #   [t, "pause"] 暂停              [t, "resume"] 继续
+        self.inputs = inputs if inputs is not None else []
+        self.ticks = ticks  # 录制结束时的逻辑帧数
+        self.result = result  # 录制结束时的结果，回放时用来校验
+
+    def to_dict(self):
+        return {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "difficulty": self.difficulty,
+            "level": self.level,
+            "endless": self.endless,
+            "rules": self.rules,
+            "ticks": self.ticks,
+            "result": self.result,
+            "inputs": self.inputs
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != REPLAY_VERSION:
+            raise ValueError(f"不支持的录像版本: {data.get('version')}")
+        return cls(data["seed"], data["difficulty"], data["level"], data["inputs"],
+                   data["ticks"], data.get("result"), data.get("endless", 0), data.get("rules"))
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def world_result(world):
+    """用于校验回放是否一致的关键结果"""
+    return {
+        "tick": world.tick,
+        "completed": world.completed,
+        "game_over": world.game_over,
+        "zombies_killed": world.zombies_killed,
+        "sun_count": world.sun_count
+    }
+
+
+class ReplayRecorder:
+    """前端的输入都经过它转发给World，同时按逻辑帧号记录下来"""
+
+    def __init__(self, world):
+        self.world = world
+        self.replay = Replay(world.seed, world.difficulty, world.level, endless=world.endless,
+                             rules=dict(world.rules))
+
+    def _record(self, *action):
+        self.replay.inputs.append([self.world.tick, *action])
+
+    def place_plant(self, kind, row, col):
+        plant = self.world.place_plant(kind, row, col)
+        if plant is not None:
+            self._record("p", kind, row, col)
+        return plant
+
+    def collect_sun(self, sun_id):
+        value = self.world.collect_sun(sun_id)
+        if value:
+            self._record("s", sun_id)
+        return value
+
+    def pause(self):
+        self._record("pause")
+
+    def resume(self):
+        self._record("resume")
+
+    def finish(self):
+        """结束录制，返回录像"""
+        self.replay.ticks = self.world.tick
+        self.replay.result = world_result(self.world)
+        return self.replay
+
+
+def apply_input(world, action):
+    kind = action[1]
+    if kind == "p":
+        world.place_plant(action[2], action[3], action[4])
+    elif kind == "s":
+        world.collect_sun(action[2])
+    # 暂停和继续不影响逻辑状态，只用来还原时间线
+
+
+def play(replay, world_cls=World, ticks=None):
+    """无界面全速回放，返回回放结束时的World"""
+    world = world_cls(replay.level, replay.difficulty, seed=replay.seed, rules=replay.rules,
+                      endless=replay.endless)
+    for action in replay.inputs:
+        world.step(action[0] - world.tick)
+        apply_input(world, action)
+    end = replay.ticks if ticks is None else ticks
+    world.step(max(end - world.tick, 0))
+    return world
+
+
+def write_replay(path, data, keep=20):
+    """写入录像，再删掉同目录下较旧的录像，只保留最近keep个"""
+    write_atomic(path, data)
+    directory = os.path.dirname(path)
+    replays = sorted((os.path.join(directory, name) for name in os.listdir(directory)
+                      if name.endswith(".json")), key=os.path.getmtime)
+    for old in replays[:-keep]:
+        os.remove(old)
+
+
+def save_replay(replay, directory="data/replays", keep=20, writer=None):
+    """保存录像，只保留最近keep个，返回录像路径
+
+    给了writer（game.save.SaveWriter）时写盘和清理旧录像都在它的后台线程里做，立即返回。
+    """
+    name = f"endless{replay.endless}" if replay.endless else f"level{replay.level}"
+    path = os.path.join(directory, f"{name}_{replay.difficulty}_{replay.seed}.json")
+    write = functools.partial(write_replay, keep=keep)
+    if writer is None:
+        write(path, replay.to_dict())
+    else:
+        writer.save(path, replay.to_dict(), write=write)
+    return path
+
+
+def main(argv):
+    if not argv:
+        print("用法: python -m game.replay <录像文件> [--profile]")
+        return 1
+    replay = Replay.load(argv[0])
+    if "--profile" in argv:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        world = profiler.runcall(play, replay)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+    else:
+        world = play(replay)
+    result = world_result(world)
+    print(json.dumps(result, ensure_ascii=False))
+    if replay.result is not None and result != replay.result:
+        print(f"回放结果与录制时不一致，录制时为: {replay.result}")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,120 @@
+"""存档读写：后台线程写盘，同一文件的重复请求合并，先写临时文件再原子改名
+
+主循环只把存档的快照交给 SaveWriter，从不等待磁盘。
+"""
+
+import copy
+import json
+import os
+import threading
+
+SAVE_DIR = "data"
+
+
+def save_path(difficulty, directory=SAVE_DIR):
+    return os.path.join(directory, f"game_save_{difficulty}.json")
+
+
+def default_game_data():
+    return {
+        "current_level": 1,
+        "score": 0,
+        "unlocked_levels": 1,
+        "total_sun_collected": 0,
+        "total_zombies_killed": 0
+    }
+
+
+def read_json(path):
+    """读存档，文件不存在或损坏时返回None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_atomic(path, data):
+    """先写同目录下的临时文件再改名，写到一半断电也不会留下半个存档"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SaveWriter:
+    """后台写存档的线程，每个文件只保留最新一份待写数据"""
+
+    def __init__(self, write=write_atomic):
+        self.write = write
+        self.pending = {}  # 路径 -> (待写的快照, 写完后的回调, 写盘函数)
+        self.writing = None  # 正在写的(路径, 快照)
+        self.condition = threading.Condition()
+        self.thread = None
+        self.closed = False
+        self.requests = 0
+        self.writes = 0
+
+    def save(self, path, data, on_written=None, write=None):
+        """提交一份快照，立即返回；之前还没写的同一文件的快照被覆盖
+
+        on_written 在快照写到磁盘后由写盘线程调用，被覆盖的快照的回调不会调用。
+        write 是这份快照用的写盘函数 write(path, data)，默认用构造时给的。
+        """
+        snapshot = copy.deepcopy(data)
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("SaveWriter已关闭")
+            self.pending[path] = (snapshot, on_written, write or self.write)
+            self.requests += 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def latest(self, path):
+        """还没写到磁盘的最新快照，没有时返回None；读存档前先查这里"""
+        with self.condition:
+            if path in self.pending:
+                return copy.deepcopy(self.pending[path][0])
+            if self.writing is not None and self.writing[0] == path:
+                return copy.deepcopy(self.writing[1])
+        return None
+
+    def flush(self, timeout=None):
+        """等待所有待写的快照写完，返回是否在timeout内写完"""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and self.writing is None, timeout)
+
+    def close(self, timeout=None):
+        """写完剩下的快照后结束线程，退出游戏时调用"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending or self.closed)
+                if not self.pending:
+                    return
+                path = next(iter(self.pending))
+                data, on_written, write = self.pending.pop(path)
+                self.writing = (path, data)
+            try:
+                write(path, data)
+                self.writes += 1
+                if on_written is not None:
+                    on_written()
+            except Exception as e:
+                print(f"保存游戏数据失败: {e}")
+            with self.condition:
+                self.writing = None
+                self.condition.notify_all()
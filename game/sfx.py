@@ -0,0 +1,108 @@
+"""音效的发声管理：按类别预留声道，每种音效限制同时发声数和最短重播间隔
+
+豌豆命中这类音效一帧里可能触发几十次，全都交给混音器只会占满声道、白费CPU。
+这里超出限制的播放请求直接丢弃，所以无论一帧里发生多少次碰撞，音频开销都有上限。
+"""
+
+import pygame
+
+from .assets import LazyAssets
+
+# 类别 -> 预留的声道数
+SFX_CATEGORIES = {
+    "ui": 1,
+    "combat": 4,
+    "explosion": 2
+}
+
+# 音效名 -> (文件, 类别, 最多同时发声数, 最短重播间隔毫秒)
+SOUND_EFFECTS = {
+    "button_click": ("assets/sound/Button_click.ogg", "ui", 1, 50),
+    "cherry_bomb": ("assets/sound/cherrybomb.ogg", "explosion", 2, 100),
+    "zombie_attack": ("assets/sound/Sfx.wav", "combat", 2, 250),
+    "pea_hit": ("assets/sound/Hit.wav", "combat", 3, 80)
+}
+
+
+def load_sound(path):
+    try:
+        return pygame.mixer.Sound(path)
+    except (pygame.error, OSError):
+        print(f"警告：无法加载音效 {path}")
+        return None
+
+
+class SoundEffects:
+    def __init__(self, effects=SOUND_EFFECTS, categories=SFX_CATEGORIES, volume=0.5,
+                 loader=load_sound, clock=pygame.time.get_ticks):
+        self.effects = effects
+        self.categories = categories
+        self.volume = volume
+        self.clock = clock
+        self.loader = loader
+        self.sounds = LazyAssets(self._load, {name: (effect[0],) for name, effect in effects.items()})
+        self.channels = {}  # 类别 -> 预留的声道
+        self.playing = {}  # 声道 -> (音效名, 开始时间)
+        self.last_played = {}  # 音效名 -> 上次播放时间
+        self.dropped = 0  # 因为限制被丢弃的播放请求数
+
+    def init_channels(self, mixer=pygame.mixer, channel=None):
+        """混音器初始化之后调用：按类别预留声道，普通的 Sound.play 不会占用它们"""
+        channel = channel or mixer.Channel
+        total = sum(self.categories.values())
+        if mixer.get_num_channels() < total:
+            mixer.set_num_channels(total)
+        mixer.set_reserved(total)
+        index = 0
+        for category, count in self.categories.items():
+            self.channels[category] = [channel(index + i) for i in range(count)]
+            index += count
+
+    def _load(self, path):
+        sound = self.loader(path)
+        if sound is not None:
+            sound.set_volume(self.volume)  # 音量只在加载和改设置时设一次
+        return sound
+
+    def set_volume(self, volume):
+        self.volume = volume
+        for sound in self.sounds.loaded.values():
+            if sound is not None:
+                sound.set_volume(volume)
+
+    def play(self, name):
+        """播放一次音效，超过限制时丢弃并返回False"""
+        effect = self.effects.get(name)
+        if effect is None:
+            return False
+        path, category, max_voices, min_interval = effect
+        now = self.clock()
+        last = self.last_played.get(name)
+        if last is not None and now - last < min_interval:
+            self.dropped += 1
+            return False
+
+        channels = self.channels.get(category, ())
+        free = None
+        voices = []
+        for channel in channels:
+            if not channel.get_busy():
+                self.playing.pop(channel, None)
+                if free is None:
+                    free = channel
+            elif self.playing.get(channel, (None,))[0] == name:
+                voices.append(channel)
+        if len(voices) >= max_voices or not channels:
+            self.dropped += 1
+            return False
+        sound = self.sounds[name]
+        if sound is None:
+            return False
+
+        if free is None:
+            # 类别的声道都在用：抢占最早开始的那个
+            free = min(channels, key=lambda channel: self.playing.get(channel, (None, 0))[1])
+        free.play(sound)
+        self.playing[free] = (name, now)
+        self.last_played[name] = now
+        return True
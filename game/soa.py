@@ -0,0 +1,257 @@
+"""可选的NumPy后端：僵尸和豌豆按列存放在数组里，移动、命中和伤害按批计算
+
+植物和阳光数量很少，仍然使用对象；只有数量会爆炸的僵尸和豌豆换成数组。
+"""
+
+try:
+    import numpy as np
+except ImportError:  # numpy是可选依赖，只有用到数组后端时才需要
+    np = None
+
+from .config import FPS, GRID_ROWS, GRID_SIZE, LAWN_LEFT, LAWN_TOP, WIDTH
+from .entities import ZOMBIE_TYPES
+from .world import World
+
+ZOMBIE_KINDS = list(ZOMBIE_TYPES)
+
+ZOMBIE_COLUMNS = {
+    "x": "f8", "row": "i8", "health": "f8", "max_health": "f8", "speed": "f8",
+    "attack_cooldown": "f8", "attack_damage": "f8", "kind": "i8", "attack_sound_playing": "?"
+}
+PEA_COLUMNS = {"x": "f8", "row": "i8", "speed": "f8", "damage": "f8"}
+
+
+class Columns:
+    """按列存放的定长数组，容量不够时翻倍"""
+
+    def __init__(self, columns, capacity=64):
+        self.n = 0
+        self.arrays = {name: np.zeros(capacity, dtype) for name, dtype in columns.items()}
+
+    def __len__(self):
+        return self.n
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["arrays"][name][:self.__dict__["n"]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def append(self, **values):
+        capacity = len(self.arrays["x"])
+        if self.n == capacity:
+            for name, array in self.arrays.items():
+                grown = np.zeros(capacity * 2, array.dtype)
+                grown[:capacity] = array
+                self.arrays[name] = grown
+        for name, value in values.items():
+            self.arrays[name][self.n] = value
+        self.n += 1
+
+    def compact(self, keep):
+        """只保留keep为True的行"""
+        count = int(keep.sum())
+        if count == self.n:
+            return
+        for array in self.arrays.values():
+            array[:count] = array[:self.n][keep]
+        self.n = count
+
+    def reorder(self, order):
+        """按order重新排列所有行"""
+        for array in self.arrays.values():
+            array[:self.n] = array[:self.n][order]
+
+
+def first_within(rows, xs, query_rows, query_xs, distance):
+    """rows/xs 已按(行, x)排序；对每个查询点返回本行中 |x - 查询x| < distance 的最左侧下标，没有时为-1
+
+    逐行在原始x上二分，比较方式和 LaneIndex.first_within 完全相同，不会因为把行号和x
+    压成一个浮点数而丢掉精度。
+    """
+    found = np.full(len(query_xs), -1)
+    starts = np.searchsorted(rows, np.arange(GRID_ROWS + 1))
+    for row in range(GRID_ROWS):
+        start, end = starts[row], starts[row + 1]
+        queries = np.flatnonzero(query_rows == row)
+        if start == end or not len(queries):
+            continue
+        lane = xs[start:end]
+        x = query_xs[queries]
+        i = np.searchsorted(lane, x - distance, side="right")
+        inside = i < len(lane)
+        near = np.zeros(len(queries), bool)
+        near[inside] = lane[i[inside]] < x[inside] + distance
+        found[queries[near]] = start + i[near]
+    return found
+
+
+class ZombieView:
+    """渲染用的只读僵尸快照"""
+    __slots__ = ("kind", "row", "x", "y", "health", "max_health")
+
+    def __init__(self, kind, row, x, health, max_health):
+        self.kind = kind
+        self.row = row
+        self.x = x
+        self.y = LAWN_TOP + row * GRID_SIZE
+        self.health = health
+        self.max_health = max_health
+
+
+class PeaView:
+    """渲染用的只读豌豆快照"""
+    __slots__ = ("kind", "row", "x", "y")
+
+    def __init__(self, row, x):
+        self.kind = "pea"
+        self.row = row
+        self.x = x
+        self.y = LAWN_TOP + row * GRID_SIZE + GRID_SIZE//2
+
+
+class ArrayWorld(World):
+    """僵尸和豌豆使用NumPy数组的World，规则与World一致，适合成百上千个实体的压力关卡"""
+
+    def _init_combat(self):
+        if np is None:
+            raise RuntimeError("数组后端需要安装numpy: pip install numpy")
+        self.zombie_data = Columns(ZOMBIE_COLUMNS)
+        self.pea_data = Columns(PEA_COLUMNS)
+        self._lane_front = None  # 每行最右侧僵尸的x，僵尸变化后失效
+
+    # 渲染接口：按需生成快照
+    @property
+    def zombies(self):
+        z = self.zombie_data
+        return [ZombieView(ZOMBIE_KINDS[kind], row, x, health, max_health)
+                for kind, row, x, health, max_health
+                in zip(z.kind.tolist(), z.row.tolist(), z.x.tolist(),
+                       z.health.tolist(), z.max_health.tolist())]
+
+    @property
+    def peas(self):
+        p = self.pea_data
+        return [PeaView(row, x) for row, x in zip(p.row.tolist(), p.x.tolist())]
+
+    # 僵尸查询
+    def zombie_ahead(self, row, x):
+        if self._lane_front is None:
+            z = self.zombie_data
+            self._lane_front = np.full(len(self.plant_lanes.lanes), -np.inf)
+            np.maximum.at(self._lane_front, z.row, z.x)
+        return self._lane_front[row] > x
+
+    def zombies_in(self, row, lo, hi):
+        z = self.zombie_data
+        removed = z.health == -np.inf
+        return np.flatnonzero((z.row == row) & (z.x >= lo) & (z.x < hi) & ~removed).tolist()
+
+    def zombie_count(self):
+        return len(self.zombie_data)
+
+    # 实体增删
+    def add_zombie(self, zombie):
+        self.zombie_data.append(
+            x=zombie.x, row=zombie.row, health=zombie.health, max_health=zombie.max_health,
+            speed=zombie.speed, attack_cooldown=zombie.attack_cooldown,
+            attack_damage=zombie.attack_damage, kind=ZOMBIE_KINDS.index(zombie.kind),
+            attack_sound_playing=False)
+        self._lane_front = None
+        self.pools.release(zombie)
+
+    def kill_zombie(self, index):
+        # 先把生命值标成-inf，植物更新完后统一压缩数组，避免下标失效
+        health = self.zombie_data.health
+        if health[index] != -np.inf:
+            health[index] = -np.inf
+            self.on_zombie_killed(None)
+            self._lane_front = None
+
+    def add_pea(self, pea):
+        self.pea_data.append(x=pea.x, row=pea.row, speed=pea.speed, damage=pea.damage)
+        self.pools.release(pea)
+
+    # 批量更新
+    def _update_plants(self):
+        super()._update_plants()
+        z = self.zombie_data
+        if len(z):
+            z.compact(z.health != -np.inf)
+
+    def _sort_zombies(self):
+        """把僵尸数组按(行, x)排好序，x相同时保持原来的先后（新来的在最后），和 LaneIndex 的稳定排序一致"""
+        z = self.zombie_data
+        row, x = z.row, z.x
+        # 僵尸每帧只走一点，没有新僵尸时多数帧仍然有序，线性检查一遍就能跳过排序
+        if not ((row[1:] < row[:-1]) | ((row[1:] == row[:-1]) & (x[1:] < x[:-1]))).any():
+            return
+        # 先按行、再在每行内按x稳定排序；数组基本有序，两次都接近线性
+        order = np.argsort(row, kind="stable")
+        starts = np.searchsorted(row[order], np.arange(GRID_ROWS + 1))
+        for lane in range(GRID_ROWS):
+            indices = order[starts[lane]:starts[lane + 1]]
+            order[starts[lane]:starts[lane + 1]] = indices[np.argsort(x[indices], kind="stable")]
+        z.reorder(order)
+
+    def _update_peas(self):
+        p, z = self.pea_data, self.zombie_data
+        # 每帧都排序，和 World 每帧刷新行索引一样，x相同的僵尸先后才能一致
+        if len(z):
+            self._sort_zombies()
+        if not len(p):
+            return
+        p.x[:] += p.speed
+
+        hit = np.zeros(len(p), bool)
+        if len(z):
+            # 每个豌豆二分找到本行最左侧距离小于30的僵尸
+            i = first_within(z.row, z.x, p.row, p.x, 30)
+            hit = i >= 0
+            if hit.any():
+                np.subtract.at(z.health, i[hit], p.damage[hit])
+                self.play_sound("pea_hit")
+
+        p.compact(~hit & (p.x <= WIDTH))
+
+    def _update_zombies(self):
+        z = self.zombie_data
+        if len(z):
+            plants = [plant for lane in self.plant_lanes.lanes for plant in lane if plant.alive]
+            blocked = np.zeros(len(z), bool)
+            if plants:
+                # 植物按(行, x)排好序，每个僵尸二分找到本行距离小于一格的植物
+                i = first_within(np.array([plant.row for plant in plants]),
+                                 np.array([plant.x for plant in plants], float), z.row, z.x, GRID_SIZE)
+                blocked = i >= 0
+
+                attacking = blocked & (z.attack_cooldown <= 0)
+                if attacking.any():
+                    damage = np.zeros(len(plants))
+                    np.add.at(damage, i[attacking], z.attack_damage[attacking])
+                    for plant, amount in zip(plants, damage.tolist()):
+                        plant.health -= amount
+                    z.attack_cooldown[attacking] = 1 * FPS  # 1秒攻击间隔
+                    if (attacking & ~z.attack_sound_playing).any():
+                        self.play_sound("zombie_attack")
+                    z.attack_sound_playing[attacking] = True
+
+            walking = ~blocked
+            z.x[walking] -= z.speed[walking]
+            z.attack_sound_playing[walking] = False
+            cooling = z.attack_cooldown > 0
+            z.attack_cooldown[cooling] -= 1
+
+            dead = z.health <= 0
+            for _ in range(int(dead.sum())):
+                self.on_zombie_killed(None)
+            leaked = (z.x < LAWN_LEFT) & ~dead
+            for _ in range(int(leaked.sum())):
+                if self.on_zombie_leaked(None):
+                    dead |= leaked
+            z.compact(~dead)
+            self._lane_front = None
+
+    def _sweep(self):
+        # 僵尸和豌豆的数组在各自的阶段里已经压缩
+        self._sweep_plants_and_suns()
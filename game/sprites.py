@@ -0,0 +1,38 @@
+"""精灵的批量绘制：按层和行收集 (图像, 位置[, 区域])，每层用一次 Surface.blits 贴出
+
+层与层之间按给定顺序绘制，后面的层整层压在前面的层上：主循环的 SPRITE_LAYERS 把 "bars"
+排在 "zombies" 之后，所有血条都画在所有僵尸上面，不会被任何一行的僵尸挡住。同一层里按行
+从上到下排列，只决定同一层内互相重叠的图像谁在上面（下面一行的僵尸压住上面一行的僵尸）。
+逐个 screen.blit 的Python开销随实体数线性增长，batch之后每层只剩一次调用。
+"""
+
+
+class SpriteBatch:
+    def __init__(self, layers, rows):
+        self.layers = layers  # 层名，按绘制顺序
+        self.buckets = {layer: [[] for _ in range(rows)] for layer in layers}
+
+    def lanes(self, layer):
+        """某一层每行的待绘制列表，实体很多时直接往里append，省掉逐个调用add的开销"""
+        return self.buckets[layer]
+
+    def add(self, layer, row, image, pos, area=None):
+        """登记一张图，area是只贴图像的一部分（比如血条图集里的一行）"""
+        self.buckets[layer][row].append((image, pos) if area is None else (image, pos, area))
+
+    def flush(self, surface, collect_rects=False):
+        """按层绘制并清空；collect_rects为True时返回所有画过的区域（局部刷新用）"""
+        rects = []
+        for layer in self.layers:
+            items = []
+            for lane in self.buckets[layer]:
+                if lane:
+                    items.extend(lane)
+                    lane.clear()
+            if not items:
+                continue
+            if collect_rects:
+                rects.extend(surface.blits(items))
+            else:
+                surface.blits(items, doreturn=False)
+        return rects
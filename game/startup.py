@@ -0,0 +1,34 @@
+"""启动耗时报告：记录从程序开始执行到第一帧菜单画面，每一步花了多少毫秒"""
+
+import time
+import unicodedata
+
+
+class StartupReport:
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.steps = []  # [(步骤名, 毫秒)]
+
+    def mark(self, name):
+        """记录从上一步结束到现在的耗时"""
+        now = time.perf_counter()
+        self.steps.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    @property
+    def total_ms(self):
+        return (self.last - self.start) * 1000
+
+    def format(self):
+        rows = self.steps + [("合计", self.total_ms)]
+        width = max(display_width(name) for name, _ in rows)
+        lines = ["启动耗时:"]
+        for name, ms in rows:
+            lines.append(f"  {name}{' ' * (width - display_width(name))} {ms:8.1f} ms")
+        return "\n".join(lines)
+
+
+def display_width(text):
+    """终端里的显示宽度，中文占两格"""
+    return sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in text)
@@ -0,0 +1,82 @@
+"""文字渲染缓存：字体只探测一次，渲染好的文字表面按LRU缓存复用"""
+
+from collections import OrderedDict
+from functools import lru_cache
+
+import pygame
+
+FONT_PATHS = [
+    "simkai.ttf",
+    "msyh.ttc",
+    "simhei.ttf",
+    "simsun.ttc",
+    "C:/Windows/Fonts/simkai.ttf",
+    "C:/Windows/Fonts/msyh.ttc",
+    "C:/Windows/Fonts/simhei.ttf",
+    "C:/Windows/Fonts/simsun.ttc"
+]
+
+
+# 字体设置：每个字号只探测一次字体文件
+@lru_cache(maxsize=None)
+def get_font(size):
+    for font_path in FONT_PATHS:
+        try:
+            return pygame.font.Font(font_path, size)
+        except (OSError, pygame.error):
+            continue
+
+    return pygame.font.SysFont(None, size)
+
+
+class TextCache:
+    """按(文字, 字号, 颜色)缓存渲染结果，超过容量时淘汰最久未用的"""
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color, antialias=True):
+        key = (text, size, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = get_font(size).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(text, size, color):
+    return TEXT_CACHE.render(text, size, color)
+
+
+class Label:
+    """HUD上的一行文字：只有内容变化时才重新取表面"""
+
+    def __init__(self, size, color):
+        self.size = size
+        self.color = color
+        self.text = None
+        self.surface = None
+
+    def set(self, text):
+        if text != self.text:
+            self.text = text
+            self.surface = render_text(text, self.size, self.color)
+        return self.surface
+
+    def draw(self, screen, text, pos):
+        return screen.blit(self.set(text), pos)
@@ -0,0 +1,137 @@
+"""界面场景：每个游戏状态一个场景，只有当前场景的控件参与命中测试
+
+悬停只在鼠标移动时更新，点击和悬停都先查空间网格，只检查鼠标所在格子里的控件，
+每帧的界面开销和屏幕上有多少控件有关，而不是和整个游戏一共有多少控件有关。
+"""
+
+import pygame
+
+CELL_SIZE = 100  # 空间网格的格子边长（像素）
+
+
+class SpatialGrid:
+    """按矩形覆盖的格子索引控件，控件的rect不会移动"""
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (格子x, 格子y) -> 控件列表
+
+    def insert(self, widget):
+        rect = widget.rect
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                self.cells.setdefault((cx, cy), []).append(widget)
+
+    def at(self, pos):
+        """包含pos的控件，后加入的（画在上层的）在前"""
+        candidates = self.cells.get((pos[0] // self.cell_size, pos[1] // self.cell_size), ())
+        return [widget for widget in reversed(candidates) if widget.rect.collidepoint(pos)]
+
+
+class Scene:
+    def __init__(self, cell_size=CELL_SIZE):
+        self.widgets = []
+        self.handlers = {}  # 控件 -> (点击回调, 判断是否可点击的函数)
+        self.grid = SpatialGrid(cell_size)
+        self.hovered = None
+        self.dragging = None  # 按下后接管拖动和松开的控件（比如滑动条）
+
+    def add(self, widget, on_click=None, enabled=None):
+        """加入一个有 rect、is_hovered、is_clicked 的控件，返回控件本身"""
+        self.widgets.append(widget)
+        self.handlers[widget] = (on_click, enabled)
+        self.grid.insert(widget)
+        return widget
+
+    def widget_at(self, pos):
+        widgets = self.grid.at(pos)
+        return widgets[0] if widgets else None
+
+    def hover(self, pos):
+        """更新悬停的控件，有变化时返回True"""
+        widget = self.widget_at(pos)
+        if widget is self.hovered:
+            return False
+        if self.hovered is not None:
+            self.hovered.is_hovered = False
+        if widget is not None:
+            widget.is_hovered = True
+        self.hovered = widget
+        return True
+
+    def clear_hover(self):
+        if self.hovered is not None:
+            self.hovered.is_hovered = False
+            self.hovered = None
+
+    def click(self, pos, event):
+        """把点击交给pos处的控件，调用了回调时返回True；有 drag 方法的控件之后接管拖动"""
+        for widget in self.grid.at(pos):
+            on_click, enabled = self.handlers[widget]
+            if enabled is not None and not enabled():
+                continue
+            if widget.is_clicked(pos, event):
+                if hasattr(widget, "drag"):
+                    self.dragging = widget
+                if on_click is not None:
+                    on_click()
+                return True
+        return False
+
+    def drag(self, pos):
+        """拖动中的控件跟随鼠标，值变化后再调用一次它的回调"""
+        widget = self.dragging
+        if widget is None:
+            return False
+        widget.drag(pos)
+        on_click, _ = self.handlers[widget]
+        if on_click is not None:
+            on_click()
+        return True
+
+    def release(self):
+        if self.dragging is not None:
+            self.dragging.release()
+            self.dragging = None
+
+
+class SceneManager:
+    """游戏状态 -> 场景；没有控件的状态（比如游戏中）用一个空场景"""
+
+    def __init__(self, state=None):
+        self.scenes = {}
+        self.state = state
+
+    def scene(self, state):
+        if state not in self.scenes:
+            self.scenes[state] = Scene()
+        return self.scenes[state]
+
+    @property
+    def current(self):
+        return self.scene(self.state)
+
+    def switch(self, state, mouse_pos=None):
+        """切换场景：清掉旧场景的悬停，新场景按当前鼠标位置算一次悬停"""
+        if state == self.state:
+            return
+        self.current.clear_hover()
+        self.current.release()
+        self.state = state
+        if mouse_pos is not None:
+            self.current.hover(mouse_pos)
+
+    def handle_event(self, event):
+        """鼠标移动更新悬停或拖动，左键按下做点击、松开结束拖动；界面需要重画时返回True"""
+        scene = self.current
+        if event.type == pygame.MOUSEMOTION:
+            if scene.dragging is not None:
+                return scene.drag(event.pos)
+            return scene.hover(event.pos)
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            return scene.click(event.pos, event)
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            scene.release()
+        return False
+
@@ -0,0 +1,151 @@
+"""出怪时间表：开局时按关卡、难度和种子一次性算出整关的 (帧, 行, 僵尸种类)
+
+旗帜之间是零星出场的僵尸，间隔随关卡进度缩短；每面旗帜前留一段空档，然后一大波僵尸
+轮流从各行出场，最后一面旗帜就是最后一波。整关的出怪数量、时长和峰值在开局时就确定了，
+主循环每帧只取出到期的条目，也可以不跑游戏直接检查或统计时间表（见 scripts/waves.py）。
+
+无尽模式（EndlessWaves）没有终点，每一波比上一波大，快用完时才生成下一波。
+"""
+
+import bisect
+import random
+
+from .config import (BURST_INTERVAL, ENDLESS_FIRST_WAVE, ENDLESS_GROWTH, ENDLESS_WAVE_TICKS,
+                     FLAG_WARNING, FPS, GRID_ROWS, level_rules)
+
+
+def pick_kind(rng, level, rules):
+    """根据关卡决定生成什么类型的僵尸"""
+    rand = rng.random()
+    if level >= rules["buckethead_level"] and rand < rules["buckethead_chance"]:
+        return "buckethead_zombie"
+    if level >= rules["roadblock_level"] and rand < rules["roadblock_chance"]:
+        return "roadblock_zombie"
+    return "zombie"
+
+
+class WavePlan:
+    def __init__(self, entries, flags):
+        self.entries = entries  # 按帧排好序的 (帧, 行, 僵尸种类)
+        self.flags = flags  # 每面旗帜的一大波开始的帧，最后一个是最后一波
+        self.next = 0  # 下一个还没出场的条目
+
+    @property
+    def total(self):
+        return len(self.entries)
+
+    @property
+    def duration(self):
+        """最后一只僵尸出场的帧"""
+        return self.entries[-1][0] if self.entries else 0
+
+    def pop_due(self, tick):
+        """取出到tick为止该出场的条目"""
+        entries = self.entries
+        start = end = self.next
+        while end < len(entries) and entries[end][0] <= tick:
+            end += 1
+        if end == start:
+            return ()
+        self.next = end
+        return entries[start:end]
+
+    def peak(self, window=10 * FPS):
+        """任意window帧内出场的最多僵尸数"""
+        best = 0
+        start = 0
+        for end, (tick, _, _) in enumerate(self.entries):
+            while self.entries[start][0] <= tick - window:
+                start += 1
+            best = max(best, end - start + 1)
+        return best
+
+    def describe(self):
+        kinds = {}
+        for _, _, kind in self.entries:
+            kinds[kind] = kinds.get(kind, 0) + 1
+        return {
+            "zombies": self.total,
+            "flags": list(self.flags),
+            "duration_s": round(self.duration / FPS, 1),
+            "peak_10s": self.peak(),
+            "kinds": kinds
+        }
+
+
+def compile_waves(level, difficulty, seed, rules=None):
+    """生成一关的出怪时间表；rules可以覆盖关卡参数，见 game.config.level_rules"""
+    rules = level_rules(difficulty, rules)
+    total = level * rules["zombies_per_level"]
+    rate = rules["spawn_rate"]
+    if total <= 0 or rate <= 0:
+        return WavePlan([], [])
+    # 用和World不同的随机数流，出怪时间表不受游戏过程影响
+    rng = random.Random(f"waves:{seed}")
+
+    flag_count = max(1, total // rules["zombies_per_flag"])
+    flag_zombies = min(total, max(flag_count, round(total * rules["flag_share"])))
+    trickle = total - flag_zombies
+
+    entries = []
+    flags = []
+    tick = 0
+    for flag in range(flag_count):
+        # 旗帜之前零星出场，平均间隔 1 / (速率 * (1 + 2 * 进度))
+        for _ in range(trickle * (flag + 1) // flag_count - trickle * flag // flag_count):
+            progress = len(entries) / total
+            tick += 1 + int(rng.expovariate(rate * (1 + progress * 2)))
+            entries.append((tick, rng.randrange(GRID_ROWS), pick_kind(rng, level, rules)))
+
+        # 一大波：空档之后依次出场，行按打乱的顺序轮流，每一行都会来僵尸
+        tick += FLAG_WARNING
+        flags.append(tick)
+        lanes = []
+        for i in range(flag_zombies * (flag + 1) // flag_count - flag_zombies * flag // flag_count):
+            if not lanes:
+                lanes = list(range(GRID_ROWS))
+                rng.shuffle(lanes)
+            entries.append((tick + i * BURST_INTERVAL, lanes.pop(), pick_kind(rng, level, rules)))
+        tick = entries[-1][0]
+    return WavePlan(entries, flags)
+
+
+class EndlessWaves(WavePlan):
+    """无尽模式的时间表：第n波有 ENDLESS_FIRST_WAVE * ENDLESS_GROWTH**(n-1) 只僵尸，
+    都在 ENDLESS_WAVE_TICKS 帧内出场，每波之前留一段空档"""
+
+    def __init__(self, difficulty, seed, start_wave=1, rules=None):
+        super().__init__([], [])
+        self.rules = level_rules(difficulty, rules)
+        self.rng = random.Random(f"endless:{seed}")
+        self.start_wave = start_wave
+        self.wave = start_wave - 1  # 已经生成到第几波
+        self.end_tick = 0  # 已生成部分最后一只僵尸的出场帧
+
+    def current_wave(self, tick):
+        """tick时已经开始的最后一波，第一波开始前为0"""
+        started = bisect.bisect_right(self.flags, tick)
+        return self.start_wave + started - 1 if started else 0
+
+    def pop_due(self, tick):
+        while self.end_tick <= tick:
+            self._next_wave()
+        return super().pop_due(tick)
+
+    def _next_wave(self):
+        # 已经出场的条目不再需要，生成新一波时丢掉
+        del self.entries[:self.next]
+        self.next = 0
+        self.wave += 1
+        size = round(ENDLESS_FIRST_WAVE * ENDLESS_GROWTH ** (self.wave - 1))
+        start = self.end_tick + FLAG_WARNING
+        self.flags.append(start)
+        lanes = []
+        for i in range(size):
+            if not lanes:
+                lanes = list(range(GRID_ROWS))
+                self.rng.shuffle(lanes)
+            # 按波数解锁路障和铁桶，和关卡一样用 roadblock_level / buckethead_level
+            kind = pick_kind(self.rng, self.wave + 2, self.rules)
+            self.entries.append((start + i * ENDLESS_WAVE_TICKS // size, lanes.pop(), kind))
+        self.end_tick = self.entries[-1][0]
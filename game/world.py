@@ -0,0 +1,311 @@
+import itertools
+import random
+import time
+
+from .config import (GRID_COLS, GRID_ROWS, GRID_SIZE, LAWN_LEFT, PLANT_CARDS,
+                     SKY_SUN_INTERVAL, START_SUN, WIDTH, level_rules)
+from .container import EntityList
+from .entities import PLANT_TYPES, ZOMBIE_TYPES, Pea, Sun
+from .lanes import LaneIndex
+from .pool import POOLS
+from .projectiles import FlyingPea, PeaPlanner
+from .waves import EndlessWaves, compile_waves
+
+
+class World:
+    """一局游戏的全部逻辑状态，不依赖窗口和渲染，可以无界面运行"""
+
+    def __init__(self, level=1, difficulty="normal", seed=None, rules=None, endless=0):
+        self.level = level
+        self.endless = endless  # 无尽模式从第几波开始，0表示普通关卡
+        self.difficulty = difficulty
+        self.rules = level_rules(difficulty, rules)
+        # 每局独立的随机数生成器；没给种子时随机选一个并记下来，录像靠它复现
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.pools = POOLS
+        self._ids = itertools.count(1)  # 所有实体共用的稳定编号
+
+        self.plants = EntityList(self._ids)
+        self.suns = EntityList(self._ids)
+        # 按行索引，碰撞和索敌只查本行
+        self.plant_lanes = LaneIndex(GRID_ROWS)
+        self.pea_plan = None  # 豌豆命中预测，只有对象后端使用
+        self._init_combat()
+        self.sun_count = START_SUN
+        self.game_over = False
+        self.completed = False
+        self.tick = 0
+        self.next_sun_tick = SKY_SUN_INTERVAL
+
+        # 整关的出怪时间表开局时就算好，同一种子每次都一样；无尽模式没有总数，一波一波往后生成
+        if endless:
+            self.total_zombies = 0
+            self.waves = EndlessWaves(difficulty, self.seed, endless, self.rules)
+        else:
+            self.waves = compile_waves(level, difficulty, self.seed, self.rules)
+            # 僵尸总数以时间表为准，出怪速率为0等参数下时间表可能是空的
+            self.total_zombies = self.waves.total
+        self.zombies_spawned = 0
+        self.zombies_killed = 0
+        self.zombies_leaked = 0  # 进屋的僵尸
+        self.sun_collected = 0
+        self.sun_spent = 0
+
+        # 植物卡片剩余冷却帧数
+        self.card_cooldowns = {kind: 0 for kind in PLANT_CARDS}
+
+        # 尚未被前端取走的音效和尚未写入存档的统计增量
+        self.sounds = []
+        self.stats = {"score": 0, "total_sun_collected": 0, "total_zombies_killed": 0}
+
+        # 可选的分阶段计时器（game.profiler.FrameProfiler），为None时没有额外开销
+        self.profiler = None
+
+    def _init_combat(self):
+        # 僵尸和豌豆的存储，game.soa.ArrayWorld 会换成数组
+        self.zombies = EntityList(self._ids)
+        self.peas = EntityList(self._ids)
+        self.zombie_lanes = LaneIndex(GRID_ROWS)
+        self.pea_lanes = LaneIndex(GRID_ROWS)
+        if self.rules["pea_prediction"]:
+            self.pea_plan = PeaPlanner(GRID_ROWS)
+
+    # 前端接口
+    def can_plant(self, kind):
+        cost = PLANT_CARDS[kind][0]
+        return self.card_cooldowns[kind] <= 0 and self.sun_count >= cost
+
+    def plant_at(self, row, col):
+        return self.plant_lanes.at(row, LAWN_LEFT + col * GRID_SIZE)
+
+    def place_plant(self, kind, row, col):
+        """在(row, col)种下植物，成功返回植物对象，否则返回None"""
+        if self.game_over or not self.can_plant(kind):
+            return None
+        if not (0 <= row < GRID_ROWS and 0 <= col < GRID_COLS):
+            return None
+        if self.plant_at(row, col) is not None:
+            return None
+
+        plant = PLANT_TYPES[kind](row, col)
+        self.add_plant(plant)
+        cost, cooldown = PLANT_CARDS[kind]
+        self.sun_count -= cost
+        self.sun_spent += cost
+        self.card_cooldowns[kind] = cooldown
+        return plant
+
+    def sun_at(self, x, y):
+        """返回点击位置覆盖到的阳光"""
+        return [sun for sun in self.suns if (x - sun.x)**2 + (y - sun.y)**2 <= 400]
+
+    def collect_sun(self, sun_id):
+        """收集指定编号的阳光，返回获得的阳光数"""
+        sun = self.suns.get(sun_id)
+        if sun is None:
+            return 0
+        self.suns.kill(sun)
+        self.add_sun(sun.value)
+        return sun.value
+
+    def pop_sounds(self):
+        """取出并清空音效，一帧里多次step产生的音效都会保留到这里"""
+        sounds = self.sounds
+        self.sounds = []
+        return sounds
+
+    def pop_stats(self):
+        """取出并清空统计增量，由前端合并进存档"""
+        stats = self.stats
+        self.stats = {"score": 0, "total_sun_collected": 0, "total_zombies_killed": 0}
+        return stats
+
+    # 僵尸查询，植物只通过这两个方法索敌
+    def zombie_ahead(self, row, x):
+        """第row行在x右侧是否有僵尸"""
+        return self.zombie_lanes.any_ahead(row, x)
+
+    def zombies_in(self, row, lo, hi):
+        """第row行中 lo <= x < hi 的僵尸，可以交给kill_zombie"""
+        return self.zombie_lanes.between(row, lo, hi)
+
+    def zombie_count(self):
+        return len(self.zombies)
+
+    # 实体增删，同时维护按行索引。移除只是标记死亡，各阶段结束时统一压缩
+    def add_plant(self, plant):
+        self.plants.add(plant)
+        self.plant_lanes.add(plant)
+
+    def remove_plant(self, plant):
+        # 行索引里的植物帧末统一剔除，查询会跳过已经死亡的
+        self.plants.kill(plant)
+
+    def add_zombie(self, zombie):
+        self.zombies.add(zombie)
+        self.zombie_lanes.add(zombie)
+        if self.pea_plan is not None:
+            self.pea_plan.zombie_added(zombie)
+
+    def remove_zombie(self, zombie):
+        return self.zombies.kill(zombie)
+
+    def kill_zombie(self, zombie):
+        if self.remove_zombie(zombie):
+            self.on_zombie_killed(zombie)
+
+    def spawn_zombie(self, cls, row):
+        self.add_zombie(self.pools.acquire(cls, row, self.difficulty))
+
+    def spawn_pea(self, x, y, row):
+        if self.pea_plan is None:
+            self.add_pea(self.pools.acquire(Pea, x, y, row))
+            return
+        # 预测模式的豌豆不进行索引，位置按帧数推算，命中帧由 pea_plan 安排
+        pea = self.pools.acquire(FlyingPea, x, y, row, self)
+        self.peas.add(pea)
+        self.pea_plan.launch(pea, self)
+
+    def add_pea(self, pea):
+        self.peas.add(pea)
+        self.pea_lanes.add(pea)
+
+    def remove_pea(self, pea):
+        if self.peas.kill(pea) and self.pea_plan is not None:
+            self.pea_plan.cancel(pea)
+
+    def _release(self, entities):
+        # 压缩容器，死亡的实体交还对象池
+        for entity in entities.compact():
+            self.pools.release(entity)
+
+    # 实体回调
+    def play_sound(self, name):
+        # 同一音效每次step只记一次，碰撞再多前端也只处理几个音效
+        if name not in self.sounds:
+            self.sounds.append(name)
+
+    def add_sun(self, value):
+        self.sun_count += value
+        self.sun_collected += value
+        self.stats["total_sun_collected"] += value
+
+    def on_zombie_leaked(self, zombie):
+        self.zombies_leaked += 1
+        if self.rules["leak_ends_game"]:
+            self.game_over = True
+            return False
+        return True
+
+    def on_zombie_killed(self, zombie):
+        self.zombies_killed += 1
+        self.stats["score"] += 10
+        self.stats["total_zombies_killed"] += 1
+
+    # 逻辑更新
+    def step(self, n_ticks=1):
+        """推进n_ticks个逻辑帧，游戏结束或过关时提前停止，返回实际推进的帧数"""
+        for i in range(n_ticks):
+            if self.game_over or self.completed:
+                return i
+            self._tick()
+        return n_ticks
+
+    def _spawn_sky_sun(self):
+        x = self.rng.randint(LAWN_LEFT, WIDTH - 50)
+        target_y = self.rng.randint(100, 400)
+        self.suns.add(self.pools.acquire(Sun, x, target_y))
+
+    def _spawn_zombies(self):
+        # 按出怪时间表生成到期的僵尸
+        for _, row, kind in self.waves.pop_due(self.tick):
+            self.spawn_zombie(ZOMBIE_TYPES[kind], row)
+            self.zombies_spawned += 1
+
+    def _tick(self):
+        self.tick += 1
+
+        if self.profiler is None:
+            self._spawn()
+            self._update_plants()
+            self._update_peas()
+            self._update_zombies()
+            self._update_suns()
+            self._sweep()
+        else:
+            self._tick_profiled()
+
+        # 检查是否完成关卡：僵尸全部出场并且都已被消灭（或进屋）；无尽模式没有终点
+        if not self.endless and self.zombies_spawned >= self.total_zombies and self.zombie_count() == 0:
+            self.completed = True
+
+    def _tick_profiled(self):
+        # 与 _tick 的阶段顺序相同，每个阶段的耗时记到 profiler
+        profiler = self.profiler
+        for name, phase in (("sim.spawn", self._spawn), ("sim.plants", self._update_plants),
+                            ("sim.peas", self._update_peas), ("sim.zombies", self._update_zombies),
+                            ("sim.suns", self._update_suns), ("sim.sweep", self._sweep)):
+            start = time.perf_counter()
+            phase()
+            profiler.add(name, time.perf_counter() - start)
+
+    def _spawn(self):
+        # 生成阳光
+        if self.tick >= self.next_sun_tick:
+            self._spawn_sky_sun()
+            self.next_sun_tick = self.tick + SKY_SUN_INTERVAL
+
+        # 更新植物卡片冷却
+        for kind, timer in self.card_cooldowns.items():
+            if timer > 0:
+                self.card_cooldowns[kind] = timer - 1
+
+        self._spawn_zombies()
+
+    def _update_plants(self):
+        for plant in self.plants:
+            plant.update(self)
+            # 爆炸后的樱桃炸弹标记移除
+            if getattr(plant, "marked_for_removal", False):
+                self.remove_plant(plant)
+
+    def _update_peas(self):
+        # 命中或飞出屏幕的豌豆只做标记，_sweep 里刷新索引时一并剔除
+        if self.pea_plan is not None:
+            for pea in self.pea_plan.update(self):
+                self.peas.kill(pea)
+            return
+        for pea in self.peas:
+            if pea.update(self):
+                self.peas.kill(pea)
+
+    def _update_zombies(self):
+        for zombie in self.zombies:
+            if zombie.update(self) and self.on_zombie_leaked(zombie):
+                self.zombies.kill(zombie)
+            if zombie.health <= 0 and self.zombies.kill(zombie):
+                self.on_zombie_killed(zombie)
+
+    def _update_suns(self):
+        for sun in self.suns:
+            if sun.update(self):
+                self.suns.kill(sun)
+
+    def _sweep(self):
+        # 本帧标记死亡的实体统一剔除：刷新行索引、压缩容器、交还对象池
+        self.pea_lanes.refresh()
+        self._release(self.peas)
+        self.zombie_lanes.refresh()
+        self._release(self.zombies)
+        self._sweep_plants_and_suns()
+
+    def _sweep_plants_and_suns(self):
+        # 移除被吃掉的植物
+        for plant in self.plants:
+            if plant.health <= 0:
+                self.remove_plant(plant)
+        if self.plants.dead:
+            self.plant_lanes.refresh()
+        self._release(self.plants)
+        self._release(self.suns)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+关卡平衡测试脚本
+用脚本化的种植策略无界面地把每个关卡、每个难度各跑N局，多进程并行，
+统计胜率、通关用时、阳光收支和漏怪数量。
+
+示例:
+    python scripts/balance.py --runs 50 --levels 1-30
+    python scripts/balance.py --levels 7 --difficulties hard --rule hard:spawn_rate=0.012
+    python scripts/balance.py --no-game-over --csv balance.csv
+"""
+
+import argparse
+import csv
+import multiprocessing
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game import FPS, MAX_LEVEL, World
+from game.config import level_rules
+from game.policy import ScriptedPolicy, run_policy
+
+DIFFICULTIES = ("easy", "normal", "hard")
+MAX_MINUTES = 20  # 单局最长模拟的游戏时间
+
+
+def parse_levels(text):
+    """解析 "1-30" 或 "1,3,7" 形式的关卡列表"""
+    levels = []
+    for part in text.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            levels.extend(range(int(start), int(end) + 1))
+        else:
+            levels.append(int(part))
+    return levels
+
+
+def parse_rules(items):
+    """解析 --rule [难度:]参数=值，返回 {难度: {参数: 值}}"""
+    overrides = {difficulty: {} for difficulty in DIFFICULTIES}
+    for item in items:
+        target, _, assignment = item.rpartition(":")
+        name, _, value = assignment.partition("=")
+        value = float(value) if "." in value else int(value)
+        for difficulty in ([target] if target else DIFFICULTIES):
+            overrides[difficulty][name] = value
+    # 提前校验参数名，免得每个子进程各报一遍错
+    for difficulty, rules in overrides.items():
+        level_rules(difficulty, rules)
+    return overrides
+
+
+def simulate(task):
+    """在子进程里跑一局，返回结果"""
+    level, difficulty, seed, rules, max_ticks = task
+    world = run_policy(World(level, difficulty, seed=seed, rules=rules), ScriptedPolicy(), max_ticks)
+    return {
+        "level": level,
+        "difficulty": difficulty,
+        "seed": seed,
+        "won": world.completed and world.zombies_leaked == 0,
+        "ticks": world.tick,
+        "sun_collected": world.sun_collected,
+        "sun_spent": world.sun_spent,
+        "zombies_leaked": world.zombies_leaked,
+        "zombies_killed": world.zombies_killed,
+        "total_zombies": world.total_zombies
+    }
+
+
+def summarize(results):
+    """按(关卡, 难度)汇总"""
+    groups = {}
+    for result in results:
+        groups.setdefault((result["level"], result["difficulty"]), []).append(result)
+
+    rows = []
+    for (level, difficulty), runs in sorted(groups.items(), key=lambda item: (item[0][0], DIFFICULTIES.index(item[0][1]))):
+        wins = [run for run in runs if run["won"]]
+        rows.append({
+            "level": level,
+            "difficulty": difficulty,
+            "runs": len(runs),
+            "win_rate": len(wins) / len(runs),
+            "win_seconds": statistics.mean(run["ticks"] for run in wins) / FPS if wins else None,
+            "sun_collected": statistics.mean(run["sun_collected"] for run in runs),
+            "sun_spent": statistics.mean(run["sun_spent"] for run in runs),
+            "zombies_leaked": statistics.mean(run["zombies_leaked"] for run in runs),
+            "kill_ratio": statistics.mean(run["zombies_killed"] / max(run["total_zombies"], 1) for run in runs)
+        })
+    return rows
+
+
+def print_table(rows):
+    print(f"{'关卡':>4} {'难度':>6} {'局数':>4} {'胜率':>6} {'通关秒数':>8} {'收集阳光':>8} {'花费阳光':>8} {'漏怪':>6} {'击杀比':>6}")
+    for row in rows:
+        win_seconds = f"{row['win_seconds']:.0f}" if row["win_seconds"] is not None else "-"
+        print(f"{row['level']:>4} {row['difficulty']:>6} {row['runs']:>4} {row['win_rate']:>6.0%} {win_seconds:>8} "
+              f"{row['sun_collected']:>8.0f} {row['sun_spent']:>8.0f} {row['zombies_leaked']:>6.1f} {row['kill_ratio']:>6.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="关卡平衡蒙特卡洛测试")
+    parser.add_argument("--runs", type=int, default=20, help="每个关卡和难度跑多少局")
+    parser.add_argument("--levels", default=f"1-{MAX_LEVEL}", help="关卡，如 1-30 或 1,3,7")
+    parser.add_argument("--difficulties", default=",".join(DIFFICULTIES))
+    parser.add_argument("--seed", type=int, default=0, help="第一局的随机种子")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--rule", action="append", default=[], help="覆盖关卡参数，如 hard:spawn_rate=0.012")
+    parser.add_argument("--no-game-over", action="store_true", help="僵尸进屋后继续，统计漏怪数量")
+    parser.add_argument("--csv", help="把汇总结果写入CSV文件")
+    args = parser.parse_args()
+
+    overrides = parse_rules(args.rule)
+    if args.no_game_over:
+        for rules in overrides.values():
+            rules["leak_ends_game"] = False
+    max_ticks = MAX_MINUTES * 60 * FPS
+    tasks = [(level, difficulty, args.seed + run, overrides[difficulty], max_ticks)
+             for level in parse_levels(args.levels)
+             for difficulty in args.difficulties.split(",")
+             for run in range(args.runs)]
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers) as pool:
+        results = list(pool.imap_unordered(simulate, tasks, chunksize=max(1, len(tasks) // (args.workers * 8))))
+    elapsed = time.perf_counter() - start
+
+    rows = summarize(results)
+    print_table(rows)
+    print(f"\n共 {len(tasks)} 局，{args.workers} 个进程，用时 {elapsed:.1f} 秒")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"已写入: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+基准测试脚本
+用固定种子和固定布局跑几个典型的压力场景，统计逻辑帧率、单帧耗时分位数和内存峰值，
+与保存的基线比较，退步超过容差时返回非零退出码。
+
+场景:
+    full_lawn      第30关困难难度、不停出怪的僵尸潮，草地种满豌豆射手并不断补种，同屏四百多个实体
+    buckethead     五行全是铁桶僵尸，每行三棵豌豆射手
+    cherry_bombs   每两秒种六颗樱桃炸弹，爆炸前放出一百零五只僵尸，每轮全部炸死
+    menu_idle      主菜单空闲时的绘制和刷新（无窗口的dummy显示驱动）
+    endless        无尽模式从第26波开始（STRESS_START_WAVE），草地种满豌豆射手并不断补种，
+                   同屏三千多个僵尸和豌豆
+    endless_draw   同样的无尽模式场面，每帧逻辑加 draw_game 的完整绘制和刷新
+
+帧耗时目标（TARGETS，p95）与基线无关，超过目标同样算失败。
+内存峰值在每个场景单独的子进程里测量，不受之前跑过的场景和对象池的影响。
+无尽模式的两个场景是 Zombie.update、豌豆命中和 draw_game 的扩展性测试，目标和实测
+（Linux x86_64 Python 3.11，对象后端，约3400个实体）:
+    endless        逻辑帧 p95 <= 4ms     实测约1.8ms，逻辑加速到4倍也留有余量
+    endless_draw   整帧   p95 <= 33.3ms  实测平均约13ms、p95约16~19ms（血条和精灵批量绘制
+                                        之前平均约23ms），同屏三千多个实体时不低于30FPS，
+                                        多数帧能到60FPS；剩下的大头是SDL的逐像素混合
+
+示例:
+    python scripts/benchmark.py
+    python scripts/benchmark.py --scenarios full_lawn,cherry_bombs --backend array
+    python scripts/benchmark.py --backend object,array --update-baseline
+
+基线与机器有关，换了机器请先在改动前的代码上 --update-baseline；两个后端在同一次运行里
+一起更新，免得基线里混着不同版本代码的结果。
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game import FPS, GRID_COLS, GRID_ROWS, GRID_SIZE, LAWN_LEFT, World
+from game.config import STRESS_START_WAVE
+from game.entities import NormalZombie
+from game.profiler import percentile
+
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmark_baseline.json"
+TOLERANCE = 0.25  # 允许的波动：帧率低于基线25%，或耗时、内存高于基线25%才算退步
+TARGETS = {"endless": 4.0, "endless_draw": 1000 / 30}  # 场景 -> p95帧耗时上限（毫秒）
+CHERRY_FUSE = 2 * FPS  # 樱桃炸弹从种下到爆炸的帧数，与 CherryBomb.explode_timer 一致
+CHERRY_LEAD = 10  # cherry_bombs 场景在爆炸前多少帧放出僵尸
+
+
+def fill_lawn(world, kind, rows=range(GRID_ROWS), cols=range(GRID_COLS)):
+    """不计阳光和冷却，把指定格子种上kind"""
+    for row in rows:
+        for col in cols:
+            world.sun_count = max(world.sun_count, 10**6)
+            world.card_cooldowns[kind] = 0
+            world.place_plant(kind, row, col)
+
+
+def step(world):
+    """推进一个逻辑帧，返回同屏的僵尸和豌豆数"""
+    world.step(1)
+    return world.zombie_count() + len(world.peas)
+
+
+def setup_full_lawn(world_cls):
+    # 不分旗帜、出怪概率调到0.2，平均每五帧一只，一分钟内同屏四百多个僵尸和豌豆
+    world = world_cls(30, "hard", seed=1, rules={"spawn_rate": 0.2, "flag_share": 0.0, "zombies_per_flag": 10**6,
+                                                 "leak_ends_game": False})
+    ticks = [0]
+
+    def frame():
+        # 每两秒把被吃掉的豌豆射手补上
+        if ticks[0] % 120 == 0:
+            fill_lawn(world, "peashooter")
+        ticks[0] += 1
+        return step(world)
+
+    return frame
+
+
+def setup_buckethead(world_cls):
+    world = world_cls(30, "hard", seed=2, rules={"spawn_rate": 0.1, "buckethead_level": 1,
+                                                 "buckethead_chance": 1.0, "leak_ends_game": False})
+    fill_lawn(world, "peashooter", cols=range(3))
+    return lambda: step(world)
+
+
+def setup_cherry_bombs(world_cls):
+    # 僵尸都由下面补充；出怪速率极低而不是0，时间表里的僵尸不会出场，关卡也不会在炸光后结束
+    world = world_cls(30, "hard", seed=3, rules={"spawn_rate": 1e-9, "leak_ends_game": False})
+    cols = (1, 4, 7)
+    ticks = [0]
+
+    def frame():
+        # 每两秒在第1、3行的第1、4、7列各种一颗樱桃炸弹，3x3范围覆盖整片草地
+        if ticks[0] % CHERRY_FUSE == 0:
+            fill_lawn(world, "cherry_bomb", rows=(1, 3), cols=cols)
+        # 引信快烧完时在每颗炸弹右边一格放出僵尸：在爆炸范围内，又离炸弹一格以上啃不到它，
+        # 放出后走的 CHERRY_LEAD 帧也留了余量，每轮的僵尸都会被炸光
+        if ticks[0] % CHERRY_FUSE == CHERRY_FUSE - CHERRY_LEAD:
+            for row in range(GRID_ROWS):
+                for col in cols:
+                    for i in range(7):
+                        zombie = NormalZombie(row, world.difficulty)
+                        zombie.x = LAWN_LEFT + (col + 1) * GRID_SIZE + 16 + i * 8
+                        world.add_zombie(zombie)
+        ticks[0] += 1
+        return step(world)
+
+    return frame
+
+
+def frontend():
+    """无窗口地初始化显示和字体，返回 (pygame, main)"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    import main
+
+    pygame.display.init()
+    pygame.font.init()
+    main.screen = pygame.display.set_mode((main.WIDTH, main.HEIGHT))
+    return pygame, main
+
+
+def setup_menu_idle(world_cls):
+    pygame, main = frontend()
+
+    def frame():
+        pygame.event.pump()
+        main.draw_main_menu()
+        main.display.present()
+        return 0
+
+    return frame
+
+
+def endless_world(world_cls):
+    world = world_cls(1, "normal", seed=4, rules={"leak_ends_game": False}, endless=STRESS_START_WAVE)
+    ticks = [0]
+
+    def frame():
+        # 每两秒把被吃掉的豌豆射手补上，保证一直有豌豆在飞
+        if ticks[0] % 120 == 0:
+            fill_lawn(world, "peashooter")
+        ticks[0] += 1
+        return step(world)
+
+    return world, frame
+
+
+def setup_endless(world_cls):
+    # 先跑20秒，让僵尸铺满草地再开始计时
+    _, frame = endless_world(world_cls)
+    for _ in range(1200):
+        frame()
+    return frame
+
+
+def setup_endless_draw(world_cls):
+    pygame, main = frontend()
+    main.init_game()  # 卡片、录像等前端状态
+    main.world, step_world = endless_world(world_cls)
+    for _ in range(1200):
+        step_world()
+
+    def frame():
+        pygame.event.pump()
+        count = step_world()
+        main.draw_game()
+        main.display.present()
+        return count
+
+    return frame
+
+
+# 场景名 -> (准备函数, 帧数, 是否与World后端有关)
+SCENARIOS = {
+    "full_lawn": (setup_full_lawn, 3600, True),
+    "buckethead": (setup_buckethead, 3600, True),
+    "cherry_bombs": (setup_cherry_bombs, 1200, True),
+    "menu_idle": (setup_menu_idle, 600, False),
+    "endless": (setup_endless, 1200, True),
+    "endless_draw": (setup_endless_draw, 600, False)
+}
+
+
+def world_class(backend):
+    if backend == "array":
+        from game.soa import ArrayWorld
+        return ArrayWorld
+    return World
+
+
+def measure_memory(name, backend, frames):
+    """用tracemalloc统计一遍场景的内存峰值（KB）"""
+    setup, _, per_backend = SCENARIOS[name]
+    if not per_backend:
+        frontend()  # 导入前端模块、打开显示的内存不算进场景
+    world_cls = world_class(backend)  # 数组后端导入numpy的内存也不算
+    tracemalloc.start()
+    frame = setup(world_cls)
+    for _ in range(frames):
+        frame()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def measure_memory_isolated(name, backend, frames):
+    """在新的子进程里统计内存峰值：对象池、空闲表和分配器都是冷的，结果与之前跑过哪些场景无关"""
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run([sys.executable, __file__, "--measure-memory", name, "--backend", backend,
+                             "--frames", str(frames)], env=env, capture_output=True, text=True, check=True).stdout
+    return float(output.split()[-1])
+
+
+def run_scenario(name, backend="object", frames=None):
+    """跑一个场景两遍：先在本进程里计时，再在子进程里用tracemalloc统计内存峰值（它会拖慢执行）"""
+    setup, default_frames, _ = SCENARIOS[name]
+    frames = frames or default_frames
+    world_cls = world_class(backend)
+
+    frame = setup(world_cls)
+    times = []
+    peak_entities = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame_start = time.perf_counter()
+        entities = frame()
+        times.append((time.perf_counter() - frame_start) * 1000)
+        peak_entities = max(peak_entities, entities)
+    elapsed = time.perf_counter() - start
+
+    times.sort()
+    return {
+        "frames": frames,
+        "ticks_per_s": round(frames / elapsed, 1),
+        "mean_ms": round(statistics.mean(times), 4),
+        "p50_ms": round(percentile(times, 50), 4),
+        "p95_ms": round(percentile(times, 95), 4),
+        "p99_ms": round(percentile(times, 99), 4),
+        "peak_kb": measure_memory_isolated(name, backend, frames),
+        "peak_entities": peak_entities
+    }
+
+
+def result_key(name, backend):
+    return name if not SCENARIOS[name][2] else f"{name}[{backend}]"
+
+
+def compare(result, baseline, tolerance=TOLERANCE, target=None):
+    """返回退步的指标说明列表，没有退步时为空；target是p95帧耗时的绝对上限"""
+    regressions = []
+    if target is not None and result["p95_ms"] > target:
+        regressions.append(f"p95_ms {result['p95_ms']:.2f} > 目标 {target:.2f}")
+    if baseline is None:
+        return regressions
+    if result["ticks_per_s"] < baseline["ticks_per_s"] * (1 - tolerance):
+        regressions.append(f"帧率 {result['ticks_per_s']:.0f} < 基线 {baseline['ticks_per_s']:.0f}")
+    for metric in ("p95_ms", "peak_kb"):
+        if result[metric] > baseline[metric] * (1 + tolerance):
+            regressions.append(f"{metric} {result[metric]:.2f} > 基线 {baseline[metric]:.2f}")
+    return regressions
+
+
+def machine():
+    return f"{platform.system()} {platform.machine()} Python {platform.python_version()}"
+
+
+def load_baseline(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"machine": None, "results": {}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="压力场景基准测试")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="逗号分隔的场景名")
+    parser.add_argument("--backend", default="object", help="World的实现，object、array或用逗号分隔的多个")
+    parser.add_argument("--frames", type=int, help="覆盖每个场景的帧数")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="把本次结果写成新的基线")
+    parser.add_argument("--json", help="把本次结果写入JSON文件")
+    parser.add_argument("--measure-memory", metavar="SCENARIO", help=argparse.SUPPRESS)  # 子进程内部使用
+    args = parser.parse_args()
+
+    if args.measure_memory:
+        name = args.measure_memory
+        print(measure_memory(name, args.backend, args.frames or SCENARIOS[name][1]))
+        return 0
+
+    backends = args.backend.split(",")
+    for backend in backends:
+        if backend not in ("object", "array"):
+            parser.error(f"未知的后端: {backend}")
+
+    baseline = load_baseline(args.baseline)
+    if baseline["machine"] not in (None, machine()):
+        print(f"注意：基线在 {baseline['machine']} 上生成，本机为 {machine()}")
+
+    print(f"{'场景':<22} {'帧率':>8} {'平均ms':>8} {'p50':>7} {'p95':>7} {'p99':>7} {'内存KB':>9} {'实体':>6}  结果")
+    results = {}
+    failed = False
+    # 与后端无关的场景只跑一遍
+    runs = [(name, backend) for backend in backends for name in args.scenarios.split(",")
+            if SCENARIOS[name][2] or backend == backends[0]]
+    for name, backend in runs:
+        key = result_key(name, backend)
+        result = results[key] = run_scenario(name, backend, args.frames)
+        expected = baseline["results"].get(key)
+        regressions = compare(result, expected, args.tolerance, TARGETS.get(name))
+        failed = failed or bool(regressions)
+        if regressions:
+            verdict = "退步: " + "; ".join(regressions)
+        else:
+            verdict = "通过" if expected is not None else "无基线"
+        print(f"{key:<22} {result['ticks_per_s']:>8.0f} {result['mean_ms']:>8.3f} {result['p50_ms']:>7.3f} "
+              f"{result['p95_ms']:>7.3f} {result['p99_ms']:>7.3f} {result['peak_kb']:>9.0f} "
+              f"{result['peak_entities']:>6}  {verdict}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.update_baseline:
+        baseline["machine"] = machine()
+        baseline["results"].update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"已更新基线: {args.baseline}")
+        return 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
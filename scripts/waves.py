@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+出怪时间表查看脚本
+不跑游戏，直接列出每个关卡、每个难度的出怪数量、旗帜时间、时长和10秒内的出怪峰值，
+也可以把某一关的完整时间表导出来检查。
+
+示例:
+    python scripts/waves.py --levels 1-30 --difficulties hard
+    python scripts/waves.py --levels 10 --seed 7 --dump
+    python scripts/waves.py --levels 30 --rule zombies_per_flag=10 --json waves.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game import FPS
+from game.waves import compile_waves
+
+from balance import DIFFICULTIES, parse_levels, parse_rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查看出怪时间表")
+    parser.add_argument("--levels", default="1-30", help="关卡，如 1-30 或 1,3,7")
+    parser.add_argument("--difficulties", default=",".join(DIFFICULTIES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rule", action="append", default=[], help="覆盖关卡参数，[难度:]参数=值")
+    parser.add_argument("--dump", action="store_true", help="打印完整的时间表")
+    parser.add_argument("--json", help="把统计结果写入JSON文件")
+    args = parser.parse_args()
+
+    overrides = parse_rules(args.rule)
+    results = []
+    print(f"{'关卡':>4} {'难度':<8} {'僵尸':>5} {'旗帜':>4} {'时长s':>7} {'10秒峰值':>8} {'生成ms':>7}")
+    for difficulty in args.difficulties.split(","):
+        for level in parse_levels(args.levels):
+            start = time.perf_counter()
+            plan = compile_waves(level, difficulty, args.seed, overrides[difficulty])
+            elapsed = (time.perf_counter() - start) * 1000
+            info = plan.describe()
+            results.append(dict(level=level, difficulty=difficulty, **info))
+            print(f"{level:>4} {difficulty:<8} {info['zombies']:>5} {len(info['flags']):>4} "
+                  f"{info['duration_s']:>7.1f} {info['peak_10s']:>8} {elapsed:>7.2f}")
+            if args.dump:
+                flags = set(plan.flags)
+                for tick, row, kind in plan.entries:
+                    mark = "  <- 旗帜" if tick in flags else ""
+                    print(f"    {tick / FPS:8.2f}s  行{row}  {kind}{mark}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
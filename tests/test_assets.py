@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pygame
+
+from game.assets import AssetManager, LazyAssets
+
+
+class TestAssetManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp, "cache")
+        self.path = os.path.join(self.tmp, "pea.png")
+        source = pygame.Surface((32, 32), pygame.SRCALPHA)
+        source.fill((0, 200, 0, 255))
+        pygame.image.save(source, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_variant_cached(self):
+        """同一(路径, 尺寸)只加载一次，不同尺寸分别缓存"""
+        assets = AssetManager(self.cache_dir)
+        small = assets.image(self.path, (16, 16))
+        self.assertIs(assets.image(self.path, (16, 16)), small)
+        self.assertEqual(small.get_size(), (16, 16))
+        self.assertEqual(assets.image(self.path, (60, 60)).get_size(), (60, 60))
+        self.assertEqual(assets.disk_misses, 2)
+
+    def test_disk_cache(self):
+        """再次启动时直接读磁盘缓存，不再解码PNG"""
+        AssetManager(self.cache_dir).image(self.path, (16, 16))
+        assets = AssetManager(self.cache_dir)
+        with mock.patch("pygame.image.load") as load:
+            surface = assets.image(self.path, (16, 16))
+        load.assert_not_called()
+        self.assertEqual(assets.disk_hits, 1)
+        self.assertEqual(tuple(surface.get_at((8, 8))), (0, 200, 0, 255))
+
+    def test_stale_cache_replaced(self):
+        """源文件修改后缓存作废，旧缓存文件被删掉"""
+        AssetManager(self.cache_dir).image(self.path, (16, 16))
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assets = AssetManager(self.cache_dir)
+        assets.image(self.path, (16, 16))
+        self.assertEqual(assets.disk_misses, 1)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+    def test_missing_file_placeholder(self):
+        assets = AssetManager(self.cache_dir)
+        surface = assets.image(os.path.join(self.tmp, "missing.png"), (40, 40), (255, 0, 0))
+        self.assertEqual(surface.get_size(), (40, 40))
+        self.assertEqual(tuple(surface.get_at((20, 20)))[:3], (255, 0, 0))
+
+
+class TestLazyAssets(unittest.TestCase):
+    def test_load_on_first_use(self):
+        calls = []
+        assets = LazyAssets(lambda path: calls.append(path) or path.upper(), {"pea": ("pea.png",), "sun": ("sun.png",)})
+        self.assertEqual(calls, [])
+        self.assertEqual(assets["pea"], "PEA.PNG")
+        self.assertEqual(assets["pea"], "PEA.PNG")
+        self.assertIsNone(assets.get("missing"))
+        assets.preload()
+        self.assertEqual(calls, ["pea.png", "sun.png"])
+
+
+if __name__ == '__main__':
+    unittest.main()
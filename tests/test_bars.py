@@ -0,0 +1,38 @@
+import unittest
+
+import pygame
+
+from game.bars import BarAtlas
+
+RED = (255, 0, 0)
+GREEN = (0, 128, 0)
+
+
+class TestBarAtlas(unittest.TestCase):
+    def test_same_pixels_as_rects(self):
+        """从图集贴出的血条和逐个用 draw.rect 画的一样"""
+        bars = [(0, 0, 40, 100, 100), (0, 10, 40, 37, 100), (50, 0, 40, 0, 560), (50, 10, 30, 2600, 2600),
+                (0, 20, 40, -20, 100)]
+        expected = pygame.Surface((100, 30))
+        for x, y, width, value, maximum in bars:
+            pygame.draw.rect(expected, RED, (x, y, width, 5))
+            pygame.draw.rect(expected, GREEN, (x, y, width * max(value, 0) // maximum, 5))
+        atlas = BarAtlas(RED, GREEN)
+        actual = pygame.Surface((100, 30))
+        for x, y, width, value, maximum in bars:
+            surface, area = atlas.bar(width, value, maximum)
+            actual.blit(surface, (x, y), area)
+        self.assertEqual(pygame.image.tobytes(actual, "RGB"), pygame.image.tobytes(expected, "RGB"))
+
+    def test_one_atlas_per_width(self):
+        atlas = BarAtlas(RED, GREEN)
+        for i in range(1000):
+            atlas.bar(40, i, 1000)
+        surface, areas = atlas.atlas(40)
+        self.assertEqual(set(atlas.atlases), {40})
+        self.assertEqual(len(areas), 41)
+        self.assertEqual(surface.get_height(), 41 * 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
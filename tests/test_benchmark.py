@@ -0,0 +1,71 @@
+import importlib.util
+import os
+import unittest
+
+from game import World
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_benchmark():
+    spec = importlib.util.spec_from_file_location("benchmark", os.path.join(ROOT, "scripts", "benchmark.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestBenchmark(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.benchmark = load_benchmark()
+
+    def test_scenarios_run(self):
+        """每个逻辑场景都能跑起来，结果包含各项指标"""
+        for name, (_, _, per_backend) in self.benchmark.SCENARIOS.items():
+            if not per_backend:
+                continue
+            result = self.benchmark.run_scenario(name, frames=30)
+            self.assertEqual(result["frames"], 30)
+            for metric in ("ticks_per_s", "p50_ms", "p95_ms", "p99_ms", "peak_kb"):
+                self.assertGreater(result[metric], 0, (name, metric))
+
+    def test_cherry_bombs_explode(self):
+        """樱桃炸弹场景里的炸弹每轮都能炸到僵尸，不会先被啃掉"""
+        worlds = []
+
+        class RecordingWorld(World):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                worlds.append(self)
+
+        frame = self.benchmark.setup_cherry_bombs(RecordingWorld)
+        for _ in range(2 * self.benchmark.CHERRY_FUSE):
+            frame()
+        world, = worlds
+        self.assertGreater(world.zombies_killed, 0)
+        self.assertEqual(world.zombie_count(), 0)
+        self.assertEqual(world.zombies_leaked, 0)
+
+    def test_memory_isolated(self):
+        """内存峰值在子进程里测量，之前在本进程跑过什么场景都不影响结果"""
+        first = self.benchmark.measure_memory_isolated("buckethead", "object", 30)
+        self.benchmark.run_scenario("full_lawn", frames=30)
+        self.assertEqual(self.benchmark.measure_memory_isolated("buckethead", "object", 30), first)
+
+    def test_compare(self):
+        baseline = {"ticks_per_s": 1000, "p95_ms": 1.0, "peak_kb": 100}
+        self.assertEqual(self.benchmark.compare({"ticks_per_s": 900, "p95_ms": 1.2, "peak_kb": 110}, baseline), [])
+        regressions = self.benchmark.compare({"ticks_per_s": 700, "p95_ms": 1.0, "peak_kb": 200}, baseline)
+        self.assertEqual(len(regressions), 2)
+        # 绝对目标在没有基线时也要检查
+        self.assertEqual(len(self.benchmark.compare({"p95_ms": 5.0}, None, target=4.0)), 1)
+        self.assertEqual(self.benchmark.compare({"p95_ms": 3.0}, None, target=4.0), [])
+
+    def test_baseline_covers_scenarios(self):
+        baseline = self.benchmark.load_baseline(self.benchmark.BASELINE_PATH)
+        for name in self.benchmark.SCENARIOS:
+            self.assertIn(self.benchmark.result_key(name, "object"), baseline["results"])
+
+
+if __name__ == '__main__':
+    unittest.main()
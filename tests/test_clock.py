@@ -0,0 +1,50 @@
+import unittest
+
+from game import World
+from game.clock import UNCAPPED_BATCH, SimulationClock
+from game.entities import NormalZombie
+
+
+class TestSimulationClock(unittest.TestCase):
+    def test_fixed_step(self):
+        """逻辑帧数只取决于流逝的时间，与渲染帧率无关"""
+        smooth, choppy = SimulationClock(), SimulationClock()
+        smooth_ticks = sum(smooth.advance(1000 / 60) for _ in range(60))
+        choppy_ticks = sum(choppy.advance(100) for _ in range(10))
+        self.assertEqual(smooth_ticks, 60)
+        self.assertEqual(choppy_ticks, 60)
+
+    def test_speed(self):
+        """加速按倍数推进，落后太多时丢弃积压"""
+        clock = SimulationClock()
+        clock.cycle_speed()
+        self.assertEqual(clock.advance(1000 / 60 * 10), 20)
+        self.assertEqual(clock.advance(5000), clock.max_ticks_per_frame * 2)
+        self.assertEqual(clock.accumulator, 0.0)
+
+    def test_uncapped(self):
+        """不限速模式一帧推进多个逻辑帧"""
+        clock = SimulationClock()
+        clock.speed = None
+        world = World(seed=1)
+        self.assertGreater(clock.update(world, 16), 1)
+        self.assertEqual(clock.speed_label(), "极速")
+
+    def test_sounds_kept_across_steps(self):
+        """加速和不限速时一帧多次step，前面逻辑帧的音效不会丢"""
+        for speed in (4, None):
+            clock = SimulationClock()
+            clock.speed = speed
+            world = World(seed=1, rules={"spawn_rate": 0.0})
+            world.total_zombies = 100
+            zombie = NormalZombie(2)
+            zombie.x = 300
+            world.add_zombie(zombie)
+            world.spawn_pea(250, 200, 2)  # 前几帧就命中
+            self.assertGreater(clock.update(world, 1000), UNCAPPED_BATCH)
+            self.assertEqual(world.pop_sounds(), ["pea_hit"])
+            self.assertEqual(world.pop_sounds(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import itertools
+import unittest
+
+from game.container import EntityList
+from game.entities import Pea
+
+
+class TestEntityList(unittest.TestCase):
+    def test_mark_dead_and_compact(self):
+        """标记死亡后遍历跳过，压缩时一次性移除"""
+        peas = EntityList(itertools.count(1))
+        items = [peas.add(Pea(x, 0, 0)) for x in range(10)]
+        self.assertEqual([pea.id for pea in items], list(range(1, 11)))
+        for pea in items[::2]:
+            self.assertTrue(peas.kill(pea))
+        self.assertFalse(peas.kill(items[0]))
+        self.assertEqual(len(peas), 5)
+        self.assertEqual([pea.x for pea in peas], [1, 3, 5, 7, 9])
+        self.assertIsNone(peas.get(items[0].id))
+        self.assertIs(peas.get(items[1].id), items[1])
+        self.assertEqual(len(peas.compact()), 5)
+        self.assertEqual(len(peas.items), 5)
+        self.assertEqual(peas.compact(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
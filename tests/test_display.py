@@ -0,0 +1,59 @@
+import os
+import unittest
+from unittest import mock
+
+import pygame
+
+from game.display import MAX_RECTS, DisplayUpdater
+
+
+class TestDisplayUpdater(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.display.set_mode((100, 100))
+
+    def test_full_flip_when_disabled(self):
+        display = DisplayUpdater()
+        display.add(pygame.Rect(0, 0, 10, 10))
+        with mock.patch("pygame.display.flip") as flip, mock.patch("pygame.display.update") as update:
+            display.present()
+            display.present()
+        self.assertEqual(flip.call_count, 2)
+        update.assert_not_called()
+        self.assertTrue(display.needs_redraw(False))
+
+    def test_dirty_rects(self):
+        """第一帧整屏刷新，之后提交本帧和上一帧的区域"""
+        display = DisplayUpdater(enabled=True)
+        first, second = pygame.Rect(0, 0, 10, 10), pygame.Rect(20, 0, 10, 10)
+        with mock.patch("pygame.display.flip") as flip, mock.patch("pygame.display.update") as update:
+            display.add(first)
+            display.present()
+            display.add(second)
+            display.present()
+            display.present()
+        flip.assert_called_once()
+        self.assertEqual(update.call_args_list, [mock.call([first, second]), mock.call([second])])
+
+    def test_static_screen_skips_redraw(self):
+        display = DisplayUpdater(enabled=True)
+        self.assertTrue(display.needs_redraw(False))
+        display.present()
+        self.assertFalse(display.needs_redraw(False))
+        self.assertTrue(display.needs_redraw(True))
+        display.invalidate()
+        self.assertTrue(display.needs_redraw(False))
+
+    def test_many_rects_merged(self):
+        display = DisplayUpdater(enabled=True)
+        display.full = False
+        for i in range(MAX_RECTS + 1):
+            display.add(pygame.Rect(i, i, 1, 1))
+        with mock.patch("pygame.display.update") as update:
+            display.present()
+        self.assertEqual(update.call_args, mock.call([pygame.Rect(0, 0, MAX_RECTS + 1, MAX_RECTS + 1)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
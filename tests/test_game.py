@@ -1,25 +1,98 @@
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+from unittest import mock
+
 import pygame
-from game import Game, Config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 class TestGame(unittest.TestCase):
+    def test_import_has_no_side_effects(self):
+        """导入main不初始化pygame、不开窗口、不建目录、不加载资源"""
+        with tempfile.TemporaryDirectory() as tmp:
+            code = ("import sys, os, pygame; sys.path.insert(0, sys.argv[1]); import main; "
+                    "print(pygame.display.get_init(), pygame.mixer.get_init(), "
+                    "len(main.PLANT_IMAGES.loaded), len(main.sfx.sounds.loaded), sorted(os.listdir('.')))")
+            output = subprocess.run([sys.executable, "-c", code, ROOT], cwd=tmp, capture_output=True,
+                                    text=True, check=True).stdout.split("\n")[-2]
+        self.assertEqual(output, "False None 0 0 []")
+
+    def test_default_game_data(self):
+        """没有存档时从第一关开始"""
+        import main
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                data = main.load_game_data("hard")
+            finally:
+                os.chdir(cwd)
+        self.assertEqual(data["current_level"], 1)
+        self.assertEqual(data["unlocked_levels"], 1)
+
+
+class TestSettingsScene(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import main
+        cls.main = main
+        pygame.display.init()
+        pygame.font.init()
+        main.screen = pygame.display.set_mode((main.WIDTH, main.HEIGHT))
+
     def setUp(self):
-        """测试前准备"""
-        pygame.init()
-        
-    def test_config(self):
-        """测试配置"""
-        self.assertEqual(Config.SCREEN_WIDTH, 800)
-        self.assertEqual(Config.SCREEN_HEIGHT, 600)
-        
-    def test_game_initialization(self):
-        """测试游戏初始化"""
-        game = Game()
-        # 初始化测试代码
-        
+        # 测试环境没有声卡，音乐流换成假的
+        patcher = mock.patch.object(self.main.music, "stream")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def tearDown(self):
-        """测试后清理"""
-        pygame.quit()
+        self.main.set_state(self.main.GameState.MAIN_MENU)
+
+    def press(self, event_type, pos):
+        if event_type == pygame.MOUSEMOTION:
+            event = pygame.event.Event(event_type, pos=pos, rel=(0, 0), buttons=(1, 0, 0))
+        else:
+            event = pygame.event.Event(event_type, button=1, pos=pos)
+        return self.main.scenes.handle_event(event)
+
+    def test_opening_settings_keeps_volume(self):
+        """设置按钮和音乐滑动条位置重叠，点按钮进入设置时不会顺带改音量"""
+        main = self.main
+        volume = main.game_settings["music_volume"]
+        for state, button in ((main.GameState.MAIN_MENU, main.settings_button),
+                              (main.GameState.PAUSED, main.settings_from_pause_button)):
+            main.set_state(state)
+            pos = (button.rect.centerx, button.rect.top + 2)
+            self.assertTrue(main.music_slider.rect.collidepoint(pos))
+            self.assertTrue(self.press(pygame.MOUSEBUTTONDOWN, pos))
+            self.assertEqual(main.current_state, main.GameState.SETTINGS)
+            self.assertFalse(main.music_slider.dragging)
+            self.assertEqual(main.game_settings["music_volume"], volume)
+
+    def test_drag_slider(self):
+        """在设置界面按下滑动条后拖动，音量跟着变，松开后不再跟随"""
+        main = self.main
+        volume = main.game_settings["music_volume"]
+        main.set_state(main.GameState.SETTINGS)
+        rect = main.music_slider.rect
+        try:
+            self.assertTrue(self.press(pygame.MOUSEBUTTONDOWN, (rect.left + 30, rect.centery)))
+            self.assertAlmostEqual(main.game_settings["music_volume"], 0.1)
+            self.assertTrue(self.press(pygame.MOUSEMOTION, (rect.right + 50, rect.top - 40)))
+            self.assertAlmostEqual(main.game_settings["music_volume"], 1.0)
+            self.press(pygame.MOUSEBUTTONUP, (rect.right, rect.top - 40))
+            self.press(pygame.MOUSEMOTION, (rect.left, rect.centery))
+            self.assertAlmostEqual(main.game_settings["music_volume"], 1.0)
+        finally:
+            main.music_slider.update_value(rect.left + volume * rect.width)
+            main.apply_music_volume()
+
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+from game.journal import StatsJournal, journal_path
+from game.save import SaveWriter, default_game_data, read_json, save_path
+
+
+class TestStatsJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = journal_path("normal", self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_recover_after_crash(self):
+        """没合并进快照的增量在下次启动时恢复，写了一半的最后一行被忽略"""
+        journal = StatsJournal(self.path)
+        journal.recover(default_game_data())
+        journal.append(add={"total_sun_collected": 25})
+        journal.append(add={"total_sun_collected": 25, "score": 10})
+        journal.append(assign={"unlocked_levels": 2})
+        journal.file.write('{"seq":4,"add":{"sc')  # 崩溃
+        journal.close()
+
+        data = StatsJournal(self.path).recover(default_game_data())
+        self.assertEqual(data["total_sun_collected"], 50)
+        self.assertEqual(data["score"], 10)
+        self.assertEqual(data["unlocked_levels"], 2)
+
+    def test_append_after_torn_line(self):
+        with open(self.path, 'w') as f:
+            f.write('{"seq":1,"add":{"score":5}}\n{"seq":2,"ad')
+        journal = StatsJournal(self.path)
+        journal.recover(default_game_data())
+        journal.append(add={"score": 1})
+        journal.close()
+        self.assertEqual(StatsJournal(self.path).recover(default_game_data())["score"], 6)
+
+    def test_compaction(self):
+        """快照写盘后删掉它已经包含的增量，之后追加的保留下来，序号接着快照往下排"""
+        writer = SaveWriter()
+        snapshot_path = save_path("normal", self.tmp.name)
+        journal = StatsJournal(self.path)
+        data = journal.recover(default_game_data())
+        data["score"] += 10
+        journal.append(add={"score": 10})
+        data["journal_seq"] = seq = journal.seq
+        writer.save(snapshot_path, data, on_written=lambda: journal.compacted(seq))
+        writer.flush()
+        journal.append(add={"score": 5})
+        writer.close()
+        journal.close()
+
+        with open(self.path) as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertEqual(StatsJournal(self.path).recover(read_json(snapshot_path))["score"], 15)
+
+        journal.compacted(journal.seq)
+        self.assertFalse(os.path.exists(self.path))
+        restarted = StatsJournal(self.path)
+        restarted.recover({"journal_seq": 2, "score": 15})
+        self.assertEqual(restarted.append(add={"score": 1}), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
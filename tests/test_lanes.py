@@ -0,0 +1,64 @@
+import unittest
+
+from game.lanes import LaneIndex
+
+
+class Dummy:
+    def __init__(self, row, x):
+        self.row = row
+        self.x = x
+        self.alive = True
+
+
+class TestLaneIndex(unittest.TestCase):
+    def test_queries(self):
+        """按行二分查询"""
+        index = LaneIndex(2)
+        a, b, c = Dummy(0, 300), Dummy(0, 100), Dummy(1, 500)
+        for entity in (a, b, c):
+            index.add(entity)
+        self.assertEqual(index.lane(0), [b, a])
+        self.assertIs(index.first_within(0, 120, 30), b)
+        self.assertIsNone(index.first_within(0, 200, 30))
+        self.assertIs(index.first_between(0, 100, 400), a)
+        self.assertIsNone(index.first_between(0, 100, 300))
+        self.assertTrue(index.any_ahead(0, 250))
+        self.assertFalse(index.any_ahead(0, 300))
+        self.assertEqual(index.between(0, 100, 300), [b])
+        self.assertIs(index.at(1, 500), c)
+
+    def test_refresh_after_move(self):
+        """实体移动后刷新，顺序和移除都正确"""
+        index = LaneIndex(1)
+        a, b = Dummy(0, 100), Dummy(0, 200)
+        index.add(a)
+        index.add(b)
+        a.x = 250
+        index.refresh()
+        self.assertEqual(index.lane(0), [b, a])
+        a.alive = False
+        index.refresh()
+        self.assertEqual(index.lane(0), [b])
+        self.assertEqual(len(index), 1)
+
+    def test_skip_dead(self):
+        """死亡的实体留在索引里，查询会跳过，刷新后才剔除"""
+        index = LaneIndex(1)
+        a, b, c = Dummy(0, 100), Dummy(0, 100), Dummy(0, 200)
+        for entity in (a, b, c):
+            index.add(entity)
+        a.alive = c.alive = False
+        self.assertIs(index.first_within(0, 110, 30), b)
+        self.assertIs(index.at(0, 100), b)
+        self.assertEqual(index.between(0, 0, 300), [b])
+        self.assertFalse(index.any_ahead(0, 150))
+        b.alive = False
+        self.assertIsNone(index.first_between(0, 0, 300))
+        self.assertIsNone(index.at(0, 100))
+        self.assertEqual(len(index.lane(0)), 3)
+        index.refresh()
+        self.assertEqual(index.lane(0), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
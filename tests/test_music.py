@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+from game.music import MusicPlayer
+
+
+class FakeStream:
+    """代替 pygame.mixer.music，记录调用"""
+
+    def __init__(self):
+        self.loaded = None
+        self.busy = False
+        self.volume = None
+        self.plays = 0
+
+    def load(self, path):
+        self.loaded = path
+
+    def play(self, loops=0, fade_ms=0):
+        self.busy = True
+        self.plays += 1
+
+    def get_busy(self):
+        return self.busy
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+    def stop(self):
+        self.busy = False
+
+
+class TestMusicPlayer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.tracks = {}
+        for name in ("menu", "game", "credits"):
+            path = self.tracks[name] = os.path.join(self.tmp.name, f"{name}.mp3")
+            open(path, 'wb').close()
+        self.stream = FakeStream()
+        self.player = MusicPlayer(self.tracks, volume=0.5, fade_ms=100, stream=self.stream)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_same_track_not_restarted(self):
+        self.player.play("menu")
+        self.player.play("menu")
+        self.assertEqual(self.stream.plays, 1)
+
+    def test_fade_out_then_switch(self):
+        """切换曲目时先淡出，淡出结束才加载新曲目"""
+        self.player.play("menu")
+        self.player.play("game")
+        self.assertEqual(self.stream.loaded, self.tracks["menu"])
+        self.player.update(50)
+        self.assertAlmostEqual(self.stream.volume, 0.25)
+        self.player.update(50)
+        self.assertEqual(self.player.current, "game")
+        self.assertEqual(self.stream.loaded, self.tracks["game"])
+        self.assertAlmostEqual(self.stream.volume, 0.5)
+
+    def test_volume_change_keeps_playing(self):
+        self.player.play("menu")
+        self.player.set_volume(0.2)
+        self.assertEqual(self.stream.plays, 1)
+        self.assertAlmostEqual(self.stream.volume, 0.2)
+
+    def test_queue(self):
+        self.player.play("menu", loop=False)
+        self.player.enqueue("credits")
+        self.player.update(16)
+        self.assertEqual(self.player.current, "menu")
+        self.stream.busy = False  # 当前曲目播完
+        self.player.update(16)
+        self.assertEqual(self.player.current, "credits")
+
+    def test_missing_track_ignored(self):
+        self.assertFalse(self.player.play("missing"))
+        self.assertIsNone(self.player.current)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from game import World
+from game.config import GRID_SIZE, LAWN_LEFT
+from game.policy import ScriptedPolicy, run_policy
+
+
+class TestPolicy(unittest.TestCase):
+    def test_policy_wins_easy_level(self):
+        """僵尸出得慢时脚本策略可以通关"""
+        world = World(level=1, difficulty="easy", seed=3, rules={"spawn_rate": 0.001})
+        run_policy(world, ScriptedPolicy(), 60 * 60 * 10)
+        self.assertTrue(world.completed)
+        self.assertEqual(world.zombies_leaked, 0)
+        self.assertGreater(world.sun_spent, 0)
+
+    def test_early_easy_win_rate(self):
+        """默认参数下前两关简单难度能赢下相当一部分；出怪放慢后路障和铁桶关也能赢"""
+        def wins(level, rules=None):
+            return sum(run_policy(World(level, "easy", seed=seed, rules=rules), ScriptedPolicy(), 60 * 60 * 10).completed
+                       for seed in range(20))
+        self.assertGreaterEqual(wins(1), 15)
+        self.assertGreaterEqual(wins(2), 7)
+        self.assertGreaterEqual(wins(8, {"spawn_rate": 0.002}), 14)
+
+    def test_plant_ahead_of_zombies(self):
+        """豌豆射手、向日葵和坚果墙不会种在本行最靠前的僵尸身后"""
+        world = World(level=5, difficulty="normal", seed=1, rules={"leak_ends_game": False})
+        place_plant = world.place_plant
+        placed = []
+
+        def checked(kind, row, col):
+            fronts = [zombie.x for zombie in world.zombies if zombie.row == row]
+            if kind != "cherry_bomb" and fronts:
+                self.assertLessEqual(LAWN_LEFT + (col + 1) * GRID_SIZE, min(fronts))
+            plant = place_plant(kind, row, col)
+            if plant is not None:
+                placed.append(plant)
+            return plant
+        world.place_plant = checked
+        run_policy(world, ScriptedPolicy(), 60 * 60 * 5)
+        self.assertGreater(len(placed), 5)
+
+    def test_leak_without_game_over(self):
+        """关闭进屋即结束后只统计漏怪，关卡照常结束"""
+        world = World(level=1, difficulty="easy", seed=3, rules={"leak_ends_game": False})
+        world.step(60 * 60 * 10)
+        self.assertFalse(world.game_over)
+        self.assertTrue(world.completed)
+        self.assertEqual(world.zombies_leaked, world.total_zombies)
+
+    def test_unknown_rule(self):
+        with self.assertRaises(KeyError):
+            World(rules={"no_such_rule": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
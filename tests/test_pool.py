@@ -0,0 +1,38 @@
+import unittest
+
+from game import World
+from game.entities import NormalZombie, Pea, Sun
+from game.pool import Pool, entity_size, memory_report
+
+
+class TestPool(unittest.TestCase):
+    def test_reuse(self):
+        """回收的对象重新初始化后复用"""
+        pool = Pool(Pea)
+        pea = pool.acquire(100, 140, 0)
+        pea.x = 500
+        pool.release(pea)
+        again = pool.acquire(200, 220, 1)
+        self.assertIs(again, pea)
+        self.assertEqual((again.x, again.row), (200, 1))
+        self.assertEqual((pool.created, pool.reused), (1, 1))
+
+    def test_slots(self):
+        """实体没有实例字典"""
+        for entity in (Pea(0, 0, 0), NormalZombie(0), Sun(0, 0)):
+            self.assertFalse(hasattr(entity, "__dict__"))
+            self.assertGreater(entity_size(entity), 0)
+
+    def test_memory_report(self):
+        """按种类统计实体内存"""
+        world = World(seed=1)
+        world.place_plant("sunflower", 0, 0)
+        world.step(5 * 60)
+        report = memory_report(world)
+        self.assertEqual(report["sunflower"]["count"], 1)
+        self.assertEqual(report["sun"]["count"], 1)
+        self.assertEqual(report["sun"]["bytes_total"], report["sun"]["bytes_each"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import unittest
+
+from game import World
+from game.profiler import FrameProfiler, percentile
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 51)
+        self.assertEqual(percentile(values, 99), 100)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_disabled_records_nothing(self):
+        profiler = FrameProfiler()
+        profiler.begin_frame()
+        profiler.mark("draw")
+        profiler.end_frame()
+        self.assertEqual(len(profiler.frames), 0)
+
+    def test_ring_buffer(self):
+        profiler = FrameProfiler(history=5, enabled=True)
+        for i in range(8):
+            profiler.begin_frame()
+            profiler.add("draw", i / 1000)
+            profiler.end_frame({"zombies": i})
+        self.assertEqual([record["frame"] for record in profiler.frames], [4, 5, 6, 7, 8])
+        p50, p95, p99 = profiler.summary()["draw"]
+        self.assertAlmostEqual(p50, 5.0)
+        self.assertAlmostEqual(p99, 7.0)
+        self.assertEqual(profiler.latest_counts(), {"zombies": 7})
+
+    def test_world_phases(self):
+        """World 的每个逻辑阶段都计入分阶段耗时"""
+        profiler = FrameProfiler(enabled=True)
+        world = World(seed=1)
+        world.profiler = profiler
+        profiler.begin_frame()
+        world.step(10)
+        profiler.end_frame()
+        self.assertEqual(profiler.phases, ["sim.spawn", "sim.plants", "sim.peas",
+                                           "sim.zombies", "sim.suns", "sim.sweep"])
+
+    def test_export(self):
+        profiler = FrameProfiler(enabled=True)
+        for i in range(3):
+            profiler.begin_frame()
+            profiler.mark("events")
+            profiler.end_frame({"peas": i})
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "frames.csv")
+            self.assertEqual(profiler.export(csv_path), 3)
+            with open(csv_path) as f:
+                self.assertEqual(f.readline().strip(), "frame,total,events,count_peas")
+            json_path = os.path.join(tmp, "frames.json")
+            profiler.export(json_path)
+            with open(json_path) as f:
+                data = json.load(f)
+            self.assertEqual(len(data["frames"]), 3)
+            self.assertIn("events", data["summary"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+from game import GRID_COLS, GRID_ROWS, World
+from game.entities import NormalZombie
+from game.projectiles import FlyingPea
+
+# 出怪速率极低：时间表里的僵尸不会在测试期间出场，关卡也不会因为没有僵尸而结束
+QUIET = {"spawn_rate": 1e-9}
+
+
+def snapshot(world):
+    return (world.sun_count, world.zombies_killed, world.pop_sounds(),
+            [(zombie.id, zombie.x, zombie.health) for zombie in world.zombies],
+            [(pea.id, pea.row, pea.x) for pea in world.peas],
+            [(plant.id, plant.health) for plant in world.plants])
+
+
+class TestPeaPrediction(unittest.TestCase):
+    def test_matches_stepping(self):
+        """预测命中与逐帧移动每一帧的结果都相同"""
+        worlds = [World(10, "hard", seed=3, rules={"spawn_rate": 0.05, "leak_ends_game": False,
+                                                   "pea_prediction": prediction})
+                  for prediction in (False, True)]
+        for tick in range(1800):
+            for world in worlds:
+                if tick % 300 == 0:
+                    for row in range(GRID_ROWS):
+                        for col in range(0, GRID_COLS, 2):
+                            world.sun_count = 1000
+                            world.card_cooldowns["peashooter"] = 0
+                            world.place_plant("peashooter", row, col)
+                world.step(1)
+            self.assertEqual(snapshot(worlds[0]), snapshot(worlds[1]), tick)
+        self.assertGreater(worlds[1].zombies_killed, 0)
+
+    def test_idle_flight(self):
+        """前方没有僵尸时，豌豆只在飞出屏幕的那一帧检查一次"""
+        world = World(1, seed=1, rules=QUIET)
+        world.spawn_pea(100, 200, 2)
+        pea, = world.peas
+        self.assertIsInstance(pea, FlyingPea)
+        world.step(60)
+        self.assertEqual(pea.x, 100 + 8 * 60)
+        world.step(120)
+        self.assertEqual(len(world.peas), 0)
+        self.assertEqual(world.pea_plan.checks, 1)
+
+    def test_new_zombie_replans(self):
+        """飞行途中本行来了僵尸，豌豆照样命中"""
+        world = World(1, seed=1, rules=QUIET)
+        world.total_zombies = 100
+        world.spawn_pea(100, 200, 2)
+        world.step(10)
+        zombie = NormalZombie(2)
+        zombie.x = 400
+        world.add_zombie(zombie)
+        world.step(40)
+        self.assertEqual(zombie.health, zombie.max_health - 20)
+        self.assertEqual(len(world.peas), 0)
+
+    def test_landed_pea_drops_world(self):
+        """命中或被移除的豌豆停在最后的位置，不再引用world，回收进对象池也不会留住这一局"""
+        world = World(1, seed=1, rules=QUIET)
+        world.spawn_pea(100, 200, 2)
+        world.spawn_pea(100, 200, 3)
+        world.step(10)
+        flying, removed = world.peas
+        world.remove_pea(removed)
+        self.assertIsNone(removed.world)
+        self.assertEqual(removed.x, 180)
+        world.step(200)
+        self.assertIsNone(flying.world)
+        self.assertIsNone(flying.plan)
+        self.assertEqual(len(world.pea_plan), 0)
+
+    def test_heap_stays_small(self):
+        """不断来僵尸、反复重新规划时，堆里作废的条目不会越积越多"""
+        world = World(1, seed=1, rules=QUIET)
+        world.total_zombies = 10**6
+        for _ in range(5):
+            world.spawn_pea(100, 200, 2)
+            world.step(3)
+        for i in range(300):
+            zombie = NormalZombie(2)
+            zombie.x = 800 - i  # 每只都比之前的更近，所有豌豆都要提前醒来
+            world.add_zombie(zombie)
+            world.step(1)
+            planner = world.pea_plan
+            self.assertLessEqual(len(planner.wakeups), 2 * len(planner) + 1)
+
+    def test_fast_pea_no_tunneling(self):
+        """每帧移动超过命中范围的豌豆不会穿过僵尸"""
+        world = World(1, seed=1, rules=QUIET)
+        world.total_zombies = 100
+        zombie = NormalZombie(2)
+        zombie.x = 450
+        zombie.speed = 0
+        world.add_zombie(zombie)
+        pea = FlyingPea(105, 200, 2, world)
+        pea.speed = 100  # 逐帧移动时依次落在205、305、405、505，都离僵尸30以上
+        world.peas.add(pea)
+        world.pea_plan.launch(pea, world)
+        world.step(10)
+        self.assertEqual(zombie.health, zombie.max_health - 20)
+        self.assertEqual(len(world.peas), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
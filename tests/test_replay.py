@@ -0,0 +1,85 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from game import World
+from game import replay as replay_module
+from game.replay import Replay, ReplayRecorder, play, save_replay, world_result
+from game.save import SaveWriter
+
+
+class TestReplay(unittest.TestCase):
+    def record(self, rules=None):
+        world = World(level=3, difficulty="normal", seed=7, rules=rules)
+        recorder = ReplayRecorder(world)
+        world.step(30)
+        recorder.place_plant("sunflower", 2, 0)
+        world.step(300)
+        for sun in list(world.suns):
+            recorder.collect_sun(sun.id)
+        recorder.pause()
+        recorder.resume()
+        world.step(200)
+        recorder.place_plant("peashooter", 2, 1)
+        world.step(1500)
+        return recorder.finish()
+
+    def test_same_seed_same_world(self):
+        """相同种子的两局完全一致"""
+        first, second = World(seed=5), World(seed=5)
+        first.step(3000)
+        second.step(3000)
+        self.assertEqual(world_result(first), world_result(second))
+        self.assertEqual([(z.row, z.x) for z in first.zombies], [(z.row, z.x) for z in second.zombies])
+
+    def test_playback(self):
+        """保存再读取的录像回放结果与录制时一致"""
+        replay = self.record()
+        self.assertEqual(len(replay.inputs), 5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "replay.json")
+            replay.save(path)
+            loaded = Replay.load(path)
+        self.assertEqual(world_result(play(loaded)), replay.result)
+
+    def test_playback_rules(self):
+        """录像保存关卡参数，非默认参数的一局也能按原参数回放"""
+        rules = {"spawn_rate": 2.0, "flag_share": 0.5, "pea_prediction": False}
+        replay = self.record(rules)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "replay.json")
+            replay.save(path)
+            loaded = Replay.load(path)
+        for key, value in rules.items():
+            self.assertEqual(loaded.rules[key], value)
+        self.assertEqual(world_result(play(loaded)), replay.result)
+        # 不带参数回放（旧行为）会得到不同的结果
+        loaded.rules = None
+        self.assertNotEqual(world_result(play(loaded)), replay.result)
+
+    def test_save_in_background(self):
+        """交给SaveWriter的录像在写盘线程里写入和清理，只保留最近keep个"""
+        threads = []
+        write_atomic = replay_module.write_atomic
+
+        def write(path, data):
+            threads.append(threading.current_thread().name)
+            write_atomic(path, data)
+        writer = SaveWriter()
+        with tempfile.TemporaryDirectory() as directory, mock.patch.object(replay_module, "write_atomic", write):
+            paths = []
+            for seed in range(3):
+                paths.append(save_replay(Replay(seed, "normal", 1, ticks=seed), directory, keep=2, writer=writer))
+                writer.flush()
+                # 保证修改时间不同，清理时按时间排序
+                os.utime(paths[-1], (seed, seed))
+            writer.close()
+            self.assertEqual(sorted(os.listdir(directory)), sorted(os.path.basename(path) for path in paths[1:]))
+            self.assertEqual(Replay.load(paths[2]).ticks, 2)
+        self.assertEqual(threads, ["save-writer"] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from game.save import SaveWriter, read_json, save_path, write_atomic
+
+
+class TestSave(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = save_path("normal", self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_atomic(self):
+        write_atomic(self.path, {"score": 10})
+        self.assertEqual(read_json(self.path), {"score": 10})
+        self.assertEqual(os.listdir(self.tmp.name), ["game_save_normal.json"])
+
+    def test_corrupt_file(self):
+        with open(self.path, 'w') as f:
+            f.write("{")
+        self.assertIsNone(read_json(self.path))
+
+    def test_writes_coalesced(self):
+        """写盘期间提交的多份快照只写最新一份"""
+        started, release = threading.Event(), threading.Event()
+        written = []
+
+        def slow_write(path, data):
+            started.set()
+            release.wait()
+            written.append(data["score"])
+
+        writer = SaveWriter(slow_write)
+        writer.save(self.path, {"score": 0})
+        started.wait()
+        data = {"score": 1}
+        for score in range(1, 6):
+            data["score"] = score
+            writer.save(self.path, data)
+        data["score"] = 100  # 提交的是快照，之后修改不影响
+        self.assertEqual(writer.latest(self.path), {"score": 5})
+        release.set()
+        writer.close()
+        self.assertEqual(written, [0, 5])
+        self.assertEqual((writer.requests, writer.writes), (6, 2))
+
+    def test_close_flushes(self):
+        writer = SaveWriter()
+        writer.save(self.path, {"score": 3})
+        writer.close()
+        self.assertEqual(read_json(self.path), {"score": 3})
+        self.assertIsNone(writer.latest(self.path))
+        with self.assertRaises(RuntimeError):
+            writer.save(self.path, {"score": 4})
+
+
+if __name__ == '__main__':
+    unittest.main()
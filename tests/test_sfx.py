@@ -0,0 +1,95 @@
+import unittest
+
+from game.sfx import SoundEffects
+
+
+class FakeSound:
+    def __init__(self, path):
+        self.path = path
+        self.volume = None
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+
+class FakeChannel:
+    def __init__(self, index):
+        self.index = index
+        self.sound = None
+
+    def get_busy(self):
+        return self.sound is not None
+
+    def play(self, sound):
+        self.sound = sound
+
+
+class FakeMixer:
+    Channel = FakeChannel
+
+    def __init__(self):
+        self.channels = 8
+        self.reserved = 0
+
+    def get_num_channels(self):
+        return self.channels
+
+    def set_num_channels(self, count):
+        self.channels = count
+
+    def set_reserved(self, count):
+        self.reserved = count
+
+
+class TestSoundEffects(unittest.TestCase):
+    def setUp(self):
+        self.now = 0
+        effects = {
+            "hit": ("hit.wav", "combat", 2, 50),
+            "bite": ("bite.wav", "combat", 2, 0),
+            "click": ("click.ogg", "ui", 1, 0),
+            "beep": ("beep.ogg", "ui", 1, 0)
+        }
+        self.mixer = FakeMixer()
+        self.sfx = SoundEffects(effects, {"ui": 1, "combat": 3}, volume=0.4,
+                                loader=FakeSound, clock=lambda: self.now)
+        self.sfx.init_channels(self.mixer)
+
+    def test_reserved_channels(self):
+        self.assertEqual(self.mixer.reserved, 4)
+        self.assertEqual([channel.index for channel in self.sfx.channels["combat"]], [1, 2, 3])
+
+    def test_min_interval(self):
+        """重播间隔内的请求被丢弃"""
+        self.assertTrue(self.sfx.play("hit"))
+        self.assertFalse(self.sfx.play("hit"))
+        self.now = 50
+        self.assertTrue(self.sfx.play("hit"))
+        self.assertEqual(self.sfx.dropped, 1)
+
+    def test_max_voices(self):
+        """同一音效最多同时发声max_voices次，不会占满整个类别"""
+        for i in range(10):
+            self.now += 100
+            self.sfx.play("hit")
+        busy = [channel.sound.path for channel in self.sfx.channels["combat"] if channel.get_busy()]
+        self.assertEqual(busy, ["hit.wav", "hit.wav"])
+        self.assertTrue(self.sfx.play("bite"))
+
+    def test_voice_stealing(self):
+        """类别声道都在用时抢占最早开始的"""
+        self.sfx.play("click")
+        self.assertFalse(self.sfx.play("click"))
+        self.assertTrue(self.sfx.play("beep"))
+        self.assertEqual(self.sfx.channels["ui"][0].sound.path, "beep.ogg")
+
+    def test_volume_set_once(self):
+        self.sfx.play("hit")
+        sound = self.sfx.sounds["hit"]
+        self.assertEqual(sound.volume, 0.4)
+        self.sfx.set_volume(0.8)
+        self.assertEqual(sound.volume, 0.8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from game import GRID_COLS, GRID_ROWS, World
+from game.entities import NormalZombie
+
+
+def final_state(world):
+    return (world.zombies_killed, world.zombies_leaked, world.sun_count,
+            sorted((plant.row, plant.col, plant.health) for plant in world.plants),
+            sorted((zombie.row, zombie.x, zombie.health) for zombie in world.zombies),
+            sorted((pea.row, pea.x) for pea in world.peas))
+
+
+@unittest.skipIf(numpy is None, "需要numpy")
+class TestArrayWorld(unittest.TestCase):
+    def setUp(self):
+        from game.soa import ArrayWorld
+        self.world = ArrayWorld(level=1, difficulty="easy", seed=42)
+
+    def test_headless_level(self):
+        """数组后端同样可以打完一关"""
+        world = self.world
+        for row in range(5):
+            world.card_cooldowns["peashooter"] = 0
+            world.place_plant("peashooter", row, 0)
+            world.sun_count = 1000
+        world.step(60 * 60 * 10)
+        self.assertTrue(world.completed)
+        self.assertEqual(world.zombies_killed, world.total_zombies)
+        self.assertEqual(world.zombie_count(), 0)
+
+    def test_cherry_bomb(self):
+        """樱桃炸弹清除3x3范围内的僵尸"""
+        world = self.world
+        world.total_zombies = 100  # 不让关卡提前结束
+        for row, x in ((1, 400), (2, 330), (3, 480), (2, 700)):
+            zombie = NormalZombie(row)
+            zombie.x = x
+            world.add_zombie(zombie)
+        world.place_plant("cherry_bomb", 2, 3)
+        world.step(2 * 60)
+        self.assertEqual(world.zombies_killed, 3)
+        self.assertEqual([zombie.x for zombie in world.zombies], [700 - zombie.speed * 2 * 60])
+
+    def test_matches_object_world(self):
+        """同一种子、同样操作，数组后端和对象后端的结果完全相同
+
+        包括命中距离恰好在30附近的浮点边界，以及多个僵尸堵在同一个x时谁先挨打。
+        """
+        from game.soa import ArrayWorld
+        rules = {"spawn_rate": 0.2, "flag_share": 0.0, "zombies_per_flag": 10**6, "leak_ends_game": False}
+        worlds = [cls(30, "hard", seed=1, rules=rules) for cls in (World, ArrayWorld)]
+        for world in worlds:
+            for tick in range(0, 1200, 120):
+                for row in range(GRID_ROWS):
+                    for col in range(GRID_COLS):
+                        world.sun_count = 10**6
+                        world.card_cooldowns["peashooter"] = 0
+                        world.place_plant("peashooter", row, col)
+                world.step(120)
+        self.assertEqual(final_state(worlds[0]), final_state(worlds[1]))
+        self.assertGreater(worlds[0].zombies_killed, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+import pygame
+
+from game.sprites import SpriteBatch
+
+
+class FakeSurface:
+    def __init__(self):
+        self.calls = []
+
+    def blits(self, items, doreturn=True):
+        self.calls.append(list(items))
+        if doreturn:
+            return [pygame.Rect(pos, image.get_size()) for image, pos, *_ in items]
+        return None
+
+
+class TestSpriteBatch(unittest.TestCase):
+    def setUp(self):
+        self.image = pygame.Surface((10, 10))
+
+    def test_one_blits_per_layer_sorted_by_row(self):
+        batch = SpriteBatch(("back", "front"), rows=3)
+        batch.add("front", 0, self.image, (0, 0))
+        batch.add("back", 2, self.image, (2, 2))
+        batch.add("back", 0, self.image, (0, 0))
+        batch.lanes("back")[1].append((self.image, (1, 1)))
+        batch.add("back", 0, self.image, (5, 5), pygame.Rect(0, 0, 5, 5))
+        surface = FakeSurface()
+        self.assertEqual(batch.flush(surface), [])
+        self.assertEqual(len(surface.calls), 2)
+        back, front = surface.calls
+        self.assertEqual([item[1] for item in back], [(0, 0), (5, 5), (1, 1), (2, 2)])
+        self.assertEqual(len(back[1]), 3)  # 带区域的条目原样传给blits
+        self.assertEqual([item[1] for item in front], [(0, 0)])
+
+    def test_flush_clears_and_collects_rects(self):
+        batch = SpriteBatch(("only",), rows=1)
+        batch.add("only", 0, self.image, (3, 4))
+        surface = FakeSurface()
+        self.assertEqual(batch.flush(surface, collect_rects=True), [pygame.Rect(3, 4, 10, 10)])
+        batch.flush(surface)
+        self.assertEqual(len(surface.calls), 1)  # 空的层不调用blits
+
+    def test_draws_on_real_surface(self):
+        batch = SpriteBatch(("a", "b"), rows=1)
+        red, blue = pygame.Surface((4, 4)), pygame.Surface((4, 4))
+        red.fill((255, 0, 0))
+        blue.fill((0, 0, 255))
+        batch.add("b", 0, blue, (2, 0))
+        batch.add("a", 0, red, (0, 0))
+        target = pygame.Surface((8, 4))
+        batch.flush(target)
+        self.assertEqual(target.get_at((1, 0))[:3], (255, 0, 0))
+        self.assertEqual(target.get_at((3, 0))[:3], (0, 0, 255))  # 后面的层压在前面的层上
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,19 @@
+import unittest
+
+from game.startup import StartupReport
+
+
+class TestStartupReport(unittest.TestCase):
+    def test_steps_add_up(self):
+        report = StartupReport()
+        report.mark("初始化pygame")
+        report.mark("创建窗口")
+        self.assertEqual([name for name, _ in report.steps], ["初始化pygame", "创建窗口"])
+        self.assertAlmostEqual(sum(ms for _, ms in report.steps), report.total_ms)
+        text = report.format()
+        self.assertIn("创建窗口", text)
+        self.assertIn("合计", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
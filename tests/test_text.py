@@ -0,0 +1,35 @@
+import unittest
+
+import pygame
+
+from game.text import Label, TextCache, get_font
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+
+    def test_lru(self):
+        """相同的文字复用同一个表面，超出容量时淘汰最久未用的"""
+        cache = TextCache(maxsize=2)
+        first = cache.render("阳光: 50", 24, (0, 0, 0))
+        self.assertIs(cache.render("阳光: 50", 24, (0, 0, 0)), first)
+        cache.render("阳光: 75", 24, (0, 0, 0))
+        cache.render("阳光: 100", 24, (0, 0, 0))
+        self.assertEqual(len(cache.surfaces), 2)
+        self.assertIsNot(cache.render("阳光: 50", 24, (0, 0, 0)), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+    def test_font_probed_once(self):
+        self.assertIs(get_font(20), get_font(20))
+
+    def test_label(self):
+        """内容不变时不重新取表面"""
+        label = Label(24, (0, 0, 0))
+        surface = label.set("分数: 0")
+        self.assertIs(label.set("分数: 0"), surface)
+        self.assertIsNot(label.set("分数: 10"), surface)
+
+
+if __name__ == '__main__':
+    unittest.main()
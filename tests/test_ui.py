@@ -0,0 +1,129 @@
+import unittest
+
+import pygame
+
+from game.ui import Scene, SceneManager, SpatialGrid
+
+
+class FakeButton:
+    def __init__(self, x, y, width, height):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.is_hovered = False
+        self.clicks = 0
+
+    def is_clicked(self, pos, event):
+        if self.rect.collidepoint(pos):
+            self.clicks += 1
+            return True
+        return False
+
+
+class FakeSlider(FakeButton):
+    def __init__(self, x, y, width, height):
+        super().__init__(x, y, width, height)
+        self.value = None
+
+    def is_clicked(self, pos, event):
+        if super().is_clicked(pos, event):
+            self.value = pos[0]
+            return True
+        return False
+
+    def drag(self, pos):
+        self.value = pos[0]
+
+    def release(self):
+        self.value = None
+
+
+def click(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos)
+
+
+def motion(pos):
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+
+
+class TestSpatialGrid(unittest.TestCase):
+    def test_lookup(self):
+        """跨格子的控件在每个覆盖的格子里都能查到，只返回真正包含该点的控件"""
+        grid = SpatialGrid(cell_size=50)
+        wide = FakeButton(0, 0, 200, 40)
+        small = FakeButton(60, 60, 20, 20)
+        grid.insert(wide)
+        grid.insert(small)
+        self.assertEqual(grid.at((180, 10)), [wide])
+        self.assertEqual(grid.at((70, 70)), [small])
+        self.assertEqual(grid.at((90, 70)), [])
+        self.assertEqual(grid.at((200, 10)), [])
+
+
+class TestScene(unittest.TestCase):
+    def test_hover_changes(self):
+        scene = Scene()
+        a, b = FakeButton(0, 0, 100, 40), FakeButton(0, 50, 100, 40)
+        scene.add(a)
+        scene.add(b)
+        self.assertTrue(scene.hover((10, 10)))
+        self.assertFalse(scene.hover((20, 20)))  # 还在同一个按钮上，不用重画
+        self.assertTrue(scene.hover((10, 60)))
+        self.assertFalse(a.is_hovered)
+        self.assertTrue(b.is_hovered)
+        self.assertTrue(scene.hover((500, 500)))
+        self.assertFalse(b.is_hovered)
+
+    def test_click_respects_enabled(self):
+        scene = Scene()
+        button = FakeButton(0, 0, 100, 40)
+        clicked = []
+        unlocked = [False]
+        scene.add(button, lambda: clicked.append(1), enabled=lambda: unlocked[0])
+        self.assertFalse(scene.click((10, 10), click((10, 10))))
+        self.assertEqual(button.clicks, 0)
+        unlocked[0] = True
+        self.assertTrue(scene.click((10, 10), click((10, 10))))
+        self.assertEqual(clicked, [1])
+        self.assertFalse(scene.click((200, 10), click((200, 10))))
+
+
+class TestSceneManager(unittest.TestCase):
+    def test_only_current_scene_handles_events(self):
+        scenes = SceneManager("menu")
+        menu_button = scenes.scene("menu").add(FakeButton(0, 0, 100, 40))
+        other_button = scenes.scene("other").add(FakeButton(0, 0, 100, 40))
+        self.assertTrue(scenes.handle_event(motion((10, 10))))
+        self.assertTrue(menu_button.is_hovered)
+        self.assertFalse(other_button.is_hovered)
+        scenes.handle_event(click((10, 10)))
+        self.assertEqual((menu_button.clicks, other_button.clicks), (1, 0))
+
+    def test_drag(self):
+        """按下可拖动的控件后，移动和松开都交给它，即使鼠标已经离开控件"""
+        scenes = SceneManager("settings")
+        changes = []
+        slider = scenes.scene("settings").add(FakeSlider(0, 0, 100, 20), lambda: changes.append(1))
+        self.assertTrue(scenes.handle_event(click((10, 10))))
+        self.assertTrue(scenes.handle_event(motion((300, 300))))
+        self.assertEqual(slider.value, 300)
+        self.assertEqual(len(changes), 2)
+        scenes.handle_event(pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=(300, 300)))
+        self.assertIsNone(slider.value)
+        scenes.handle_event(motion((50, 10)))
+        self.assertTrue(slider.is_hovered)
+        self.assertEqual(len(changes), 2)
+
+    def test_switch_moves_hover(self):
+        """切换场景时旧场景的悬停清掉，新场景按鼠标位置重新算"""
+        scenes = SceneManager("menu")
+        shared = FakeButton(0, 0, 100, 40)
+        scenes.scene("menu").add(shared)
+        other = scenes.scene("other").add(FakeButton(0, 50, 100, 40))
+        scenes.handle_event(motion((10, 10)))
+        scenes.switch("other", (10, 60))
+        self.assertFalse(shared.is_hovered)
+        self.assertTrue(other.is_hovered)
+        self.assertFalse(scenes.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a)))
+
+
+if __name__ == '__main__':
+    unittest.main()
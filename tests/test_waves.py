@@ -0,0 +1,97 @@
+import unittest
+
+from game import World
+from game.config import BURST_INTERVAL, ENDLESS_FIRST_WAVE, ENDLESS_GROWTH, GRID_ROWS
+from game.replay import Replay, ReplayRecorder, play, world_result
+from game.waves import EndlessWaves, compile_waves
+
+
+class TestWaves(unittest.TestCase):
+    def test_deterministic(self):
+        """同样的关卡、难度和种子得到同样的时间表"""
+        first = compile_waves(10, "normal", 7)
+        self.assertEqual(first.entries, compile_waves(10, "normal", 7).entries)
+        self.assertNotEqual(first.entries, compile_waves(10, "normal", 8).entries)
+
+    def test_plan_shape(self):
+        plan = compile_waves(10, "hard", 1)
+        self.assertEqual(plan.total, 10 * 25)
+        ticks = [tick for tick, _, _ in plan.entries]
+        self.assertEqual(ticks, sorted(ticks))
+        self.assertEqual(len(plan.flags), 250 // 20)
+        # 一大波的前五只僵尸覆盖全部五行
+        start = ticks.index(plan.flags[0])
+        burst = plan.entries[start:start + GRID_ROWS]
+        self.assertEqual(sorted(row for _, row, _ in burst), list(range(GRID_ROWS)))
+        self.assertEqual(burst[1][0] - burst[0][0], BURST_INTERVAL)
+        self.assertEqual(plan.duration, plan.entries[-1][0])
+
+    def test_rules(self):
+        self.assertEqual(compile_waves(5, "normal", 1, {"spawn_rate": 0.0}).total, 0)
+        self.assertEqual(len(compile_waves(5, "normal", 1, {"zombies_per_flag": 5}).flags), 15)
+        with self.assertRaises(KeyError):
+            compile_waves(1, "normal", 1, {"flags": 3})
+
+    def test_pop_due(self):
+        plan = compile_waves(3, "normal", 1)
+        popped = []
+        for tick in range(plan.duration + 1):
+            popped.extend(plan.pop_due(tick))
+        self.assertEqual(popped, plan.entries)
+        self.assertEqual(plan.pop_due(plan.duration + 100), ())
+
+    def test_world_follows_plan(self):
+        world = World(level=2, difficulty="normal", seed=3, rules={"leak_ends_game": False})
+        plan = compile_waves(2, "normal", 3)
+        world.step(plan.duration)
+        self.assertEqual(world.zombies_spawned, world.total_zombies)
+        self.assertEqual(world.waves.entries, plan.entries)
+
+    def test_empty_plan_ends_level(self):
+        """出怪速率为0时时间表是空的，关卡没有僵尸，第一帧就结束"""
+        world = World(level=5, difficulty="normal", seed=1, rules={"spawn_rate": 0.0})
+        self.assertEqual(world.total_zombies, 0)
+        world.step()
+        self.assertTrue(world.completed)
+
+
+class TestEndlessWaves(unittest.TestCase):
+    def test_escalation(self):
+        """每一波比上一波大，只在需要时生成下一波，出场过的条目会被丢掉"""
+        waves = EndlessWaves("normal", 1)
+        first = waves.pop_due(1)
+        self.assertEqual(waves.wave, 1)
+        self.assertEqual(len(waves.entries), ENDLESS_FIRST_WAVE)
+        spawned = len(first)
+        tick = waves.end_tick
+        while waves.wave < 5:
+            tick += 1
+            spawned += len(waves.pop_due(tick))
+        last_wave = [entry for entry in waves.entries if entry[0] >= waves.flags[-1]]
+        self.assertEqual(len(last_wave), round(ENDLESS_FIRST_WAVE * ENDLESS_GROWTH ** 4))
+        self.assertEqual(waves.current_wave(tick), 4)  # 第5波已经生成，但还在空档里
+        self.assertEqual(waves.current_wave(waves.flags[-1]), 5)
+        self.assertEqual(waves.current_wave(0), 0)
+        self.assertGreater(spawned, ENDLESS_FIRST_WAVE * 4)
+
+    def test_start_wave(self):
+        waves = EndlessWaves("normal", 1, start_wave=10)
+        waves.pop_due(1)
+        self.assertEqual(len(waves.entries), round(ENDLESS_FIRST_WAVE * ENDLESS_GROWTH ** 9))
+        self.assertEqual(waves.current_wave(waves.flags[0]), 10)
+
+    def test_endless_world_replay(self):
+        """无尽模式不会过关，录像记下起始波数并能复现"""
+        world = World(difficulty="easy", seed=5, endless=3)
+        recorder = ReplayRecorder(world)
+        recorder.place_plant("peashooter", 2, 0)
+        world.step(3000)
+        self.assertFalse(world.completed)
+        self.assertGreater(world.zombies_spawned, 0)
+        replay = Replay.from_dict(recorder.finish().to_dict())
+        self.assertEqual(replay.endless, 3)
+        self.assertEqual(world_result(play(replay)), world_result(world))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from game import World
+from game.config import PLANT_CARDS, START_SUN
+
+
+class TestWorld(unittest.TestCase):
+    def test_place_plant(self):
+        """种植扣除阳光并进入冷却"""
+        world = World(level=1, difficulty="normal", seed=1)
+        plant = world.place_plant("peashooter", 2, 3)
+        self.assertIsNotNone(plant)
+        self.assertEqual(world.sun_count, START_SUN - PLANT_CARDS["peashooter"][0])
+        # 冷却中不能再种，同一格子也不能重复种
+        self.assertIsNone(world.place_plant("peashooter", 0, 0))
+        world.card_cooldowns["peashooter"] = 0
+        self.assertIsNone(world.place_plant("peashooter", 2, 3))
+
+    def test_remove_plant_deferred(self):
+        """移除的植物帧末才离开行索引，之前的查询已经看不到它，格子可以立即重种"""
+        world = World(seed=1)
+        plant = world.place_plant("sunflower", 1, 2)
+        world.remove_plant(plant)
+        self.assertIsNone(world.plant_at(1, 2))
+        self.assertIn(plant, world.plant_lanes.lane(1))
+        world.card_cooldowns["sunflower"] = 0
+        self.assertIsNotNone(world.place_plant("sunflower", 1, 2))
+        world.step()
+        self.assertNotIn(plant, world.plant_lanes.lane(1))
+        self.assertEqual(len(world.plant_lanes), 1)
+
+    def test_collect_sun(self):
+        """天上掉落的阳光可以按编号收集"""
+        world = World(seed=1)
+        world.step(5 * 60)
+        self.assertEqual(len(world.suns), 1)
+        sun = next(iter(world.suns))
+        self.assertEqual(world.collect_sun(sun.id), 25)
+        self.assertEqual(len(world.suns), 0)
+        self.assertEqual(world.collect_sun(sun.id), 0)
+
+    def test_headless_level(self):
+        """无界面跑完一关，相同种子结果相同"""
+        def run():
+            world = World(level=1, difficulty="easy", seed=42)
+            for row in range(5):
+                world.card_cooldowns["peashooter"] = 0
+                world.sun_count = 1000
+                world.place_plant("peashooter", row, 0)
+            world.step(60 * 60 * 10)
+            return world
+        first, second = run(), run()
+        self.assertTrue(first.completed)
+        self.assertFalse(first.game_over)
+        self.assertEqual(first.zombies_killed, first.total_zombies)
+        self.assertEqual(first.tick, second.tick)
+
+
+if __name__ == '__main__':
+    unittest.main()